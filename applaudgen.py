@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os, argparse
-from applaudgen.generators.python import PythonSDKGenerator
+import os, argparse, json
+from applaudgen.generators import default_cache_dir
+from applaudgen.generators.python import GENERATORS
+from applaudgen.profiler import Profiler
 
 def main():
     cur_path = os.path.dirname(__file__)
@@ -14,11 +16,48 @@ def main():
     parser.add_argument('-o', '--output', dest='output_dir',
                         default=f'{cur_path}/PythonPackage/applaud/',
                         help='Path to the package output directory.')
+    parser.add_argument('-m', '--mock', dest='mock', action='store_true',
+                        help='Also generate a mock server and a load driver for performance testing.')
+    parser.add_argument('-b', '--benchmarks', dest='benchmarks', action='store_true',
+                        help='Also generate a benchmark suite of the client runtime (implies --mock).')
+    parser.add_argument('--models', dest='models', choices=GENERATORS.keys(), default='pydantic',
+                        help='Implementation of the schema classes: pydantic models, slotted classes with generated decoders (native), '
+                             'or native classes interning the ids of related resources (compact).')
+    parser.add_argument('--cache-dir', dest='cache_dir', default=default_cache_dir(),
+                        help='Directory of the parsed specification and compiled templates caches.')
+    parser.add_argument('--no-cache', dest='cache_dir', action='store_const', const=None,
+                        help='Parse the specification and compile templates on every run.')
+    parser.add_argument('--only-tags', dest='only_tags', nargs='+', metavar='TAG',
+                        help='Only generate the endpoints of these tags (e.g. Builds BetaTesters) and the schemas they reference.')
+    parser.add_argument('--only-paths', dest='only_paths', nargs='+', metavar='PATH',
+                        help='Only generate the endpoints of these paths, shell-style wildcards allowed (e.g. "/v1/builds*"), '
+                             'and the schemas they reference.')
+    parser.add_argument('--drop-links', dest='drop_links', action='store_true',
+                        help='Do not decode the links of resources and relationships, only those of response documents.')
+    parser.add_argument('-p', '--profile', dest='profile', nargs='?', const='-', metavar='PROFILE_FILE',
+                        help='Report wall time, call counts and peak memory per generation phase, template and filter, '
+                             'to PROFILE_FILE as JSON if given.')
 
     args = parser.parse_args()
 
-    generator = PythonSDKGenerator(spec_file=args.spec_file, output_dir=args.output_dir)
-    generator.generate()
+    profiler = Profiler() if args.profile else None
+    generator_class = GENERATORS[args.models]
+    generator = generator_class(spec_file=args.spec_file, output_dir=args.output_dir, mock=args.mock, benchmarks=args.benchmarks,
+                                profiler=profiler, cache_dir=args.cache_dir, only_tags=args.only_tags, only_paths=args.only_paths,
+                                drop_links=args.drop_links)
+    try:
+        generator.generate()
+    finally:
+        # Restores the filters wrapped by the profiler, even if the generation failed
+        if profiler:
+            profiler.finish()
+
+    if profiler:
+        if args.profile == '-':
+            print(profiler.report())
+        else:
+            with open(args.profile, 'w') as f:
+                json.dump(profiler.as_dict(), f, indent=2)
 
 if __name__ == "__main__":
     main()
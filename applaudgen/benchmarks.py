@@ -0,0 +1,292 @@
+"""
+Benchmarks of the generator itself.
+
+.. code-block:: bash
+
+    python -m applaudgen.benchmarks scaling --factors 1,5,20
+    python -m applaudgen.benchmarks decoders --items 500
+    python -m applaudgen.benchmarks memory --items 100000
+"""
+
+import argparse, contextlib, io, json, os, shutil, subprocess, sys, tempfile, time
+import orjson
+from .generators.python import GENERATORS
+from .profiler import Profiler
+
+DEFAULT_SPEC_FILE = os.path.join(os.path.dirname(__file__), '..', 'app_store_connect_api.json')
+
+# Schemas referenced by name in the generator, shared by every copy
+SHARED_SCHEMAS = ['ErrorResponse']
+
+def _rename_refs(value, prefix: str):
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if key == '$ref' and isinstance(item, str):
+                name = item.split('/')[-1]
+                result[key] = item if name in SHARED_SCHEMAS else f'#/components/schemas/{prefix}{name}'
+            else:
+                result[key] = _rename_refs(item, prefix)
+        return result
+    elif isinstance(value, list):
+        return [_rename_refs(item, prefix) for item in value]
+
+    return value
+
+def _copy_path(path: str, prefix: str) -> str:
+    # /v1/apps/{id}/builds -> /v1/copy2apps/{id}/builds
+    parts = path.split('/')
+    parts[2] = prefix + parts[2]
+    return '/'.join(parts)
+
+def _copy_operation(operation: dict, prefix: str, tag_suffix: str) -> dict:
+    operation = _rename_refs(operation, prefix)
+
+    if 'tags' in operation:
+        operation['tags'] = [f'{tag}{tag_suffix}' for tag in operation['tags']]
+    if 'operationId' in operation:
+        operation['operationId'] = f'{prefix}{operation["operationId"]}'
+
+    return operation
+
+def scale_spec(spec: dict, factor: int) -> dict:
+    """
+    Returns a copy of `spec` with `factor` times its paths, tags and schemas.
+
+    Copies are renamed (`Copy2App`, `/v1/copy2apps`, `AppsCopy2` …) so that they produce distinct
+    endpoint classes, schema classes and modules, like a grown specification would.
+    """
+    paths = dict(spec['paths'])
+    schemas = dict(spec['components']['schemas'])
+
+    for i in range(2, factor + 1):
+        prefix = f'copy{i}'
+        schema_prefix = f'Copy{i}'
+        tag_suffix = f'Copy{i}'
+
+        for path, path_spec in spec['paths'].items():
+            paths[_copy_path(path, prefix)] = {key: _copy_operation(value, schema_prefix, tag_suffix) if isinstance(value, dict) else _rename_refs(value, schema_prefix)
+                                               for key, value in path_spec.items()}
+
+        for name, schema in spec['components']['schemas'].items():
+            if name not in SHARED_SCHEMAS:
+                schemas[f'{schema_prefix}{name}'] = _rename_refs(schema, schema_prefix)
+
+    scaled = dict(spec)
+    scaled['paths'] = paths
+    scaled['components'] = dict(spec['components'], schemas=schemas)
+    return scaled
+
+def _directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+def run_scaling(spec_file: str, factors: list[int], *, mock: bool = False, models: str = 'pydantic') -> list[dict]:
+    with open(spec_file, 'rb') as f:
+        spec = orjson.loads(f.read())
+
+    results = []
+    work_dir = tempfile.mkdtemp(prefix='applaudgen-scaling-')
+    # Scaled specifications are parsed on every run, only compiled templates are reused
+    cache_dir = os.path.join(work_dir, 'cache')
+    try:
+        for factor in factors:
+            scaled_spec_file = os.path.join(work_dir, f'spec-{factor}.json')
+            output_dir = os.path.join(work_dir, f'output-{factor}', 'applaud')
+            with open(scaled_spec_file, 'wb') as f:
+                f.write(orjson.dumps(scale_spec(spec, factor)))
+
+            profiler = Profiler()
+            started = time.perf_counter()
+            # The generator prints every dummy endpoint it finds
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    GENERATORS[models](scaled_spec_file, output_dir, mock=mock, profiler=profiler, cache_dir=cache_dir).generate()
+                elapsed = time.perf_counter() - started
+            finally:
+                profiler.finish()
+
+            output_size = _directory_size(output_dir)
+            results.append({
+                'factor': factor,
+                'wall_time': elapsed,
+                'wall_time_per_copy': elapsed / factor,
+                'peak_memory': max((stats.peak_memory for stats in profiler.phases.values()), default=0),
+                'output_bytes': output_size,
+                'output_bytes_per_copy': output_size / factor,
+                'profile': profiler.as_dict(),
+            })
+            shutil.rmtree(os.path.dirname(output_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+def format_scaling(results: list[dict]) -> str:
+    """
+    Formats the results, a growing time or memory per copy reveals superlinear phases.
+    """
+    lines = [f'{"factor":>6} {"wall s":>8} {"s/copy":>8} {"peak MiB":>9} {"out MiB":>8} {"KiB/copy":>9}']
+    for result in results:
+        lines.append(f'{result["factor"]:>6} {result["wall_time"]:>8.2f} {result["wall_time_per_copy"]:>8.2f} {result["peak_memory"] / 2**20:>9.1f} '
+                     f'{result["output_bytes"] / 2**20:>8.1f} {result["output_bytes_per_copy"] / 1024:>9.1f}')
+
+    phases = list(results[0]['profile']['phases']) if results else []
+    lines.append('')
+    lines.append(f'{"phase (ms/copy)":<32}' + ''.join(f' {result["factor"]:>8}x' for result in results))
+    for phase in phases:
+        line = f'{phase:<32}'
+        for result in results:
+            stats = result['profile']['phases'].get(phase)
+            line += f' {stats["wall_time"] * 1000 / result["factor"]:>9.1f}' if stats else f' {"-":>9}'
+        lines.append(line)
+
+    # Phases writing their output as it is generated keep a flat peak
+    lines.append('')
+    lines.append(f'{"phase (peak KiB)":<32}' + ''.join(f' {result["factor"]:>8}x' for result in results))
+    for phase in phases:
+        line = f'{phase:<32}'
+        for result in results:
+            stats = result['profile']['phases'].get(phase)
+            line += f' {stats["peak_memory"] / 1024:>9.1f}' if stats else f' {"-":>9}'
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+def run_decoders(spec_file: str, *, items: int = 500, min_time: float = 0.1, pattern: str = '^validate/') -> dict[str, dict]:
+    """
+    Runs the runtime benchmarks matching `pattern` in a package generated with each implementation of the
+    schema classes, returns their results by implementation.
+    """
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix='applaudgen-decoders-')
+    try:
+        for models, generator_class in GENERATORS.items():
+            package_dir = os.path.join(work_dir, models)
+            results_file = os.path.join(work_dir, f'{models}.json')
+            with contextlib.redirect_stdout(io.StringIO()):
+                generator_class(spec_file, os.path.join(package_dir, 'applaud'), benchmarks=True, cache_dir=os.path.join(work_dir, 'cache')).generate()
+
+            # Each implementation in its own interpreter, both packages are named `applaud`
+            subprocess.run([sys.executable, '-W', 'ignore', '-m', 'applaud.benchmarks', '-k', pattern, '--items', str(items), '--min-time', str(min_time),
+                            '-o', results_file], cwd=package_dir, check=True, stdout=subprocess.DEVNULL)
+            with open(results_file) as f:
+                results[models] = json.load(f)['results']
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+def format_decoders(results: dict[str, dict]) -> str:
+    """
+    Formats the median time of each case per implementation, with the throughput of the native decoders.
+    """
+    baseline, native = results['pydantic'], results['native']
+    lines = [f'{"case":<64} {"pydantic us":>12} {"native us":>12} {"items/s":>10} {"speedup":>8}']
+    speedups = []
+    for name in sorted(baseline):
+        if name not in native:
+            continue
+
+        base, result = baseline[name], native[name]
+        speedup = base['median_us'] / result['median_us']
+        speedups.append(speedup)
+        throughput = f'{result["items"] / result["median_us"] * 1e6:>10.0f}' if result.get('items') else f'{"-":>10}'
+        lines.append(f'{name:<64} {base["median_us"]:>12.1f} {result["median_us"]:>12.1f} {throughput} {speedup:>7.1f}x')
+
+    if speedups:
+        lines.append('')
+        lines.append(f'median speedup {sorted(speedups)[len(speedups) // 2]:.1f}x over {len(speedups)} cases')
+
+    return '\n'.join(lines)
+
+# Variants of the generated package compared by the memory benchmark, with their generator options
+MEMORY_VARIANTS = {
+    'pydantic': ('pydantic', {}),
+    'native': ('native', {}),
+    'compact': ('compact', {}),
+    'compact+drop-links': ('compact', {'drop_links': True}),
+}
+
+def run_memory(spec_file: str, response_types: list[str], *, items: int = 100000) -> dict[str, dict]:
+    """
+    Measures the memory retained by decoded responses of `items` resources in a package generated with
+    each variant of the schema classes, returns their results by variant.
+    """
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix='applaudgen-memory-')
+    try:
+        for variant, (models, options) in MEMORY_VARIANTS.items():
+            package_dir = os.path.join(work_dir, variant)
+            results_file = os.path.join(work_dir, f'{variant}.json')
+            with contextlib.redirect_stdout(io.StringIO()):
+                GENERATORS[models](spec_file, os.path.join(package_dir, 'applaud'), benchmarks=True, cache_dir=os.path.join(work_dir, 'cache'),
+                                   **options).generate()
+
+            subprocess.run([sys.executable, '-W', 'ignore', '-m', 'applaud.benchmarks', '-k', '^memory/', '--memory', *response_types,
+                            '--memory-items', str(items), '-o', results_file], cwd=package_dir, check=True, stdout=subprocess.DEVNULL)
+            with open(results_file) as f:
+                results[variant] = json.load(f)['results']
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+def format_memory(results: dict[str, dict]) -> str:
+    """
+    Formats the retained bytes per resource of each case per variant, relative to the pydantic models.
+    """
+    variants = list(results)
+    lines = [f'{"case":<40}' + ''.join(f' {variant:>21}' for variant in variants)]
+    for name in sorted(results['pydantic']):
+        baseline = results['pydantic'][name]['bytes_per_item']
+        line = f'{name:<40}'
+        for variant in variants:
+            result = results[variant].get(name)
+            line += f' {result["bytes_per_item"]:>11.0f} B {result["bytes_per_item"] / baseline:>6.2f}x' if result else f' {"-":>21}'
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks of the applaudgen generator.')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    scaling = subparsers.add_parser('scaling', help='Generate code from specifications scaled from the App Store Connect one.')
+    scaling.add_argument('-s', '--spec', dest='spec_file', default=DEFAULT_SPEC_FILE, help='Path to the specification file to scale.')
+    scaling.add_argument('--factors', default='1,5,20', help='Comma separated scale factors.')
+    scaling.add_argument('-m', '--mock', action='store_true', help='Also generate the mock server.')
+    scaling.add_argument('--models', choices=GENERATORS.keys(), default='pydantic', help='Implementation of the schema classes.')
+    scaling.add_argument('-o', '--output', help='Write the JSON results to this file.')
+
+    decoders = subparsers.add_parser('decoders', help='Compare the generated native decoders with the pydantic models.')
+    decoders.add_argument('-s', '--spec', dest='spec_file', default=DEFAULT_SPEC_FILE, help='Path to the specification file.')
+    decoders.add_argument('--items', type=int, default=500, help='Resources per synthetic collection response.')
+    decoders.add_argument('--min-time', type=float, default=0.1, help='Minimal seconds spent on each case.')
+    decoders.add_argument('-k', '--filter', dest='pattern', default='^validate/', help='Runtime benchmark cases to compare.')
+    decoders.add_argument('-o', '--output', help='Write the JSON results to this file.')
+
+    memory = subparsers.add_parser('memory', help='Compare the memory retained by the responses decoded with each implementation of the schema classes.')
+    memory.add_argument('-s', '--spec', dest='spec_file', default=DEFAULT_SPEC_FILE, help='Path to the specification file.')
+    memory.add_argument('--items', type=int, default=100000, help='Resources of the synthetic responses.')
+    memory.add_argument('-r', '--responses', nargs='+', default=['BetaTestersResponse', 'BuildsResponse'], metavar='RESPONSE_CLASS',
+                        help='Response classes to decode.')
+    memory.add_argument('-o', '--output', help='Write the JSON results to this file.')
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'scaling':
+        results = run_scaling(args.spec_file, [int(factor) for factor in args.factors.split(',')], mock=args.mock, models=args.models)
+        print(format_scaling(results))
+    elif args.benchmark == 'decoders':
+        results = run_decoders(args.spec_file, items=args.items, min_time=args.min_time, pattern=args.pattern)
+        print(format_decoders(results))
+    elif args.benchmark == 'memory':
+        results = run_memory(args.spec_file, args.responses, items=args.items)
+        print(format_memory(results))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
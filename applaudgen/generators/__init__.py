@@ -3,12 +3,23 @@ from dataclasses import dataclass
 from re import template
 from jinja2.environment import Template
 from jinja2.utils import internalcode
-import orjson, os
-from typing import Any, Optional
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import os, shutil, tempfile
+from typing import Any, Iterator, Optional
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape
 from .builders.schema import SchemaClassBuilder
-from .builders.endpoint import EndpointClassBuilder, EndpointType
+from .builders.endpoint import EndpointClassBuilder
 from .utils import *
+from . import ir
+from .subset import SubsetSelector
+from .links import LinksDropper
+from ..profiler import NullProfiler
+
+# Files written by the last generation, relative to the output directory
+MANIFEST_FILE_NAME = '.applaudgen-manifest'
+
+def default_cache_dir() -> str:
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'applaudgen')
 
 class SDKGenerator(ABC):
 
@@ -16,16 +27,42 @@ class SDKGenerator(ABC):
     schema_class_builder_class: type[SchemaClassBuilder]
     endpoint_class_builder_class: type[EndpointClassBuilder]
 
-    def __init__(self, spec_file: str, output_dir: str):
-        with open(spec_file, 'r') as f:
-            self.spec = orjson.loads(f.read())
+    def __init__(self, spec_file: str, output_dir: str, *, mock: bool = False, benchmarks: bool = False, profiler: Optional[NullProfiler] = None,
+                 cache_dir: Optional[str] = None, only_tags: Optional[list[str]] = None, only_paths: Optional[list[str]] = None,
+                 drop_links: bool = False):
+        self.profiler = profiler or NullProfiler()
+
+        # With a cache directory, the parsed specification is cached by its hash and templates by the checksum of their sources
+        with self.profiler.phase('load_spec'):
+            self.ir = ir.load(spec_file, cache_dir and os.path.join(cache_dir, 'ir'))
+
+        if only_tags or only_paths:
+            with self.profiler.phase('select_subset'):
+                self.ir = SubsetSelector(self.ir, tags=only_tags, paths=only_paths).select()
+
+        if drop_links:
+            with self.profiler.phase('drop_links'):
+                self.ir = LinksDropper(self.ir).drop()
+
+        self.enum_names = frozenset(self.ir.enums).union(*(schema.remain_enums for schema in self.ir.requests + self.ir.responses + self.ir.models))
 
         cur_path = os.path.dirname(__file__)
         self.output_dir = output_dir
+        # Benchmarks use the fixtures synthesized by the mock server
+        self.mock = mock or benchmarks
+        self.benchmarks = benchmarks
         os.makedirs(self.output_dir, exist_ok=True)
 
+        # Compiled templates are shared across runs and processes
+        bytecode_cache = None
+        if cache_dir:
+            os.makedirs(os.path.join(cache_dir, 'templates'), exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(os.path.join(cache_dir, 'templates'))
+
         self.jinja_env = Environment(
             loader=FileSystemLoader(f'{cur_path}/../templates/{self.template_subdir}'),
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,
             autoescape=select_autoescape(),
             keep_trailing_newline=True,
             lstrip_blocks=True,
@@ -36,158 +73,151 @@ class SDKGenerator(ABC):
         self.jinja_env.filters["snake_case"] = snake_case
         self.jinja_env.filters["simple_singular"] = simple_singular
         self.jinja_env.add_extension("jinja2.ext.do")
+        self.profiler.instrument(self.jinja_env)
 
-    def build_schemas_code(self, definitions: dict, *, super_class: Optional[str] = None, order_keys: list = [], in_models: bool = False) -> tuple[list, dict]:
-        schemas_code = []
+    def build_schemas_code(self, schemas: list[ir.Schema], *, super_class: Optional[str] = None, shapes_module: Optional[str] = 'shapes') -> tuple[Iterator[str], dict]:
+        """
+        Returns the code of the schema classes, generated chunk by chunk as the module template writes it, and the enums left to the enums module.
+        """
         remain_enums = {}
-        sorted_keys = order_keys + [key for key in definitions.keys() if key not in order_keys]
-
-        for key in sorted_keys:
-            schema = definitions[key]
-            class_builder = self.schema_class_builder_class(self.jinja_env, key, schema, in_models)
-            code = class_builder.build(super_class)
-            remain_enums.update(class_builder.remain_enums)
-            schemas_code.append(code)
-
-        return schemas_code, remain_enums
-
-    def build_endpoints_code(self, paths: dict) -> tuple[dict, dict]:
-        not_allowed_operations = ['put', 'options', 'head', 'trace']
-        allowed_operations = ['get', 'post', 'delete', 'patch']
-
-        root_endpoints: list[EndpointClassBuilder] = []
-        leaf_endpoints: list[EndpointClassBuilder] = []
-        linkage_endpoints: list[EndpointClassBuilder] = []
-        endpoints_grouped_by_tag = {}
-
-        def create_and_add_dummy_root(dummy_path: str, child: EndpointClassBuilder, leaf: bool):
-            dummy = self.create_dummy_endpoint(dummy_path)
-            dummy.leaf_endpoints.append(child) if leaf else dummy.linkage_endpoints.append(child)
-            tag = child.tags[0]
-
-            root_endpoints.append(dummy)
-            endpoints_grouped_by_tag[tag] = endpoints_grouped_by_tag.get(tag, []) + [dummy]
-            
-
-        for path, spec in paths.items():
-            assert all(key not in not_allowed_operations for key in spec.keys()), f'Contains unknown operation method ({spec.keys()}) in path {path}'
-            
-            # Only 'get', 'post', 'delete', 'patch' and 'parameters' are handled
-            assert all(key in allowed_operations + ['parameters'] for key in spec.keys()), f'Contains unknown key ({spec.keys()}) in path {path}'
-
-            endpoint: EndpointClassBuilder = self.endpoint_class_builder_class(self.jinja_env, path, spec)
-
-            # Skip paths that do not have any allowed operations
-            if all(key not in allowed_operations for key in spec.keys()):
-                print(f'Found dummy endpoint {path}')
-                tag = 'dummy'
-            else:
-                if endpoint.endpoint_type == EndpointType.ROOT:
-                    root_endpoints.append(endpoint)
-                elif endpoint.endpoint_type == EndpointType.LEAF:
-                    leaf_endpoints.append(endpoint)
-                elif endpoint.endpoint_type == EndpointType.LINKAGE:
-                    linkage_endpoints.append(endpoint)
-                else:
-                    raise ValueError(f'Unknown endpoint type {endpoint.endpoint_type}')
-
-                tag = endpoint.tags[0]
-
-            endpoints_grouped_by_tag[tag] = endpoints_grouped_by_tag.get(tag, []) + [endpoint]
-
-        for leaf_endpoint in leaf_endpoints:
-            root_endpoint = next(iter(filter(lambda root: leaf_endpoint.path.startswith(root.path) and root.has_id_param, root_endpoints)), None)
-
-            if not root_endpoint:
-                dumy_path = '/'.join(leaf_endpoint.path.split('/')[:4])
-                print(f'Missing id endpoint for leaf endpoint {leaf_endpoint.path}, create dummy id endpoint {dumy_path}')
-                create_and_add_dummy_root(dumy_path, leaf_endpoint, True)
-            else:
-                root_endpoint.leaf_endpoints.append(leaf_endpoint)
-
-        for linkage_endpoint in linkage_endpoints:
-            root_endpoint = next(iter(filter(lambda root: linkage_endpoint.path.startswith(root.path) and root.has_id_param, root_endpoints)), None)
-
-            if not root_endpoint:
-                dumy_path = '/'.join(linkage_endpoint.path.split('/')[:4])
-                print(f'Missing id endpoint for linkage endpoint {linkage_endpoint.path}, create dummy id endpoint {dumy_path}')
-                create_and_add_dummy_root(dumy_path, leaf_endpoint, False)
-            else:
-                root_endpoint.linkage_endpoints.append(linkage_endpoint)
-
-        # Generate Endpoint Field enums
-        all_fields_enums = {}
-        for endpoint in root_endpoints + leaf_endpoints + linkage_endpoints:
-            for name, value in endpoint.fields_enums.items():
-                if name in all_fields_enums:
-                    assert all_fields_enums[name] == value, f'Field {name} is defined twice with different values'
-                else:
-                    all_fields_enums[name] = value
-
-        return root_endpoints, endpoints_grouped_by_tag, all_fields_enums
-
-    def create_dummy_endpoint(self, path: str) -> EndpointClassBuilder:
-        spec = {
-            "parameters" : [ {
-                "name" : "id",
-                "in" : "path",
-                "description" : "the id of the requested resource",
-                "schema" : {
-                "type" : "string"
-                },
-                "style" : "simple",
-                "required" : True
-            } ]
-        }
-        return self.endpoint_class_builder_class(self.jinja_env, path, spec)
+        for schema in schemas:
+            remain_enums.update(schema.remain_enums)
 
-    def generate(self):
-        enums = {}
-        requests = {}
-        responses = {}
-        models = {}
-
-        endpoints, endpoints_code_grouped_by_tag, fields_enums = self.build_endpoints_code(self.spec['paths'])
-
-        self.generate_connection_code(endpoints)
-        self.generate_endpoints_code(endpoints_code_grouped_by_tag)
-
-        self.generate_fields_code(fields_enums)
-
-        for key, value in self.spec['components']['schemas'].items():
-            if 'enum' in value:
-                # Enums
-                assert value['type'] == 'string', f'Enum {key} is not a string'
-                enums[key] = value['enum']
-            elif value["type"] == "object":
-                # Dataclasses
-                if key.endswith('Request'):
-                    # Request dataclasses
-                    requests[key] = value
-                elif key.endswith('Response'):
-                    # Response dataclasses
-                    responses[key] = value
-                else:
-                    models[key] = value
-            else:
-                assert False, f'Unknown type ({value["type"]}) in schemas!'
-
-        request_schemas, request_remain_enums = self.build_schemas_code(requests, super_class='ApplaudRequest')
-        self.generate_requests_code(request_schemas)
-
-        response_schemas, response_remain_enums = self.build_schemas_code(responses, super_class='JSONResponse')
-        self.generate_responses_code(response_schemas)
-
-        order_keys = ['ResourceLinks', 'PagingInformation', 'HttpHeader', 'ImageAsset', 'AppMediaStateError', 'AppMediaAssetState', 'UploadOperation', 'Device', 'FileLocation', 'ScmProviderType',
-        'CiTagPatterns', 'CiBranchPatterns', 'CiStartConditionFileMatcher', 'CiFilesAndFoldersRule', 'CiTestDestination', 'CiAction', 'CiGitUser', 'CiIssueCounts', 'CapabilityOption', 'CapabilitySetting', 'CiBranchStartCondition', 'CiTagStartCondition', 'CiPullRequestStartCondition', 'CiScheduledStartCondition']
-        model_schemas, model_remain_enums = self.build_schemas_code(models, order_keys=order_keys, in_models=True)
-        self.generate_models_code(model_schemas)
+        def generate_code() -> Iterator[str]:
+            for schema in schemas:
+                yield from self.schema_class_builder_class(self.jinja_env, schema, shapes_module, self.enum_names).generate(super_class)
+                yield '\n'
+
+        return generate_code(), remain_enums
+
+    def build_endpoints_code(self, root_endpoints: list[ir.Endpoint], grouped_endpoints: dict[str, list[ir.Endpoint]]) -> tuple[list, dict]:
+        builders = {}
+
+        for tag, endpoints in grouped_endpoints.items():
+            for endpoint in endpoints:
+                builders[id(endpoint)] = self.endpoint_class_builder_class(self.jinja_env, endpoint)
+
+        return [builders[id(endpoint)] for endpoint in root_endpoints], {tag: [builders[id(endpoint)] for endpoint in endpoints] for tag, endpoints in grouped_endpoints.items()}
 
+    def build_mock_routes(self, grouped_endpoints: dict) -> list[dict]:
+        routes = []
+
+        for endpoints in grouped_endpoints.values():
+            for endpoint in endpoints:
+                for method, op in [('GET', endpoint.operation_get), ('POST', endpoint.operation_post), ('PATCH', endpoint.operation_patch), ('DELETE', endpoint.operation_delete)]:
+                    if op is None:
+                        continue
+
+                    response_type = getattr(op, 'response_type', None)
+                    single_instance = getattr(op, 'response_single_instance', None)
+                    routes.append({'method': method, 'path': endpoint.path, 'response_type': response_type, 'single_instance': single_instance})
+
+        return routes
+
+    def generate(self):
+        """
+        Generates the package in a staging directory, whose files replace those of the output directory once all are written,
+        so that a failure leaves the package as it was.
+
+        Files of the previous generation that this one does not produce, e.g. the modules of tags no longer selected, are removed,
+        as listed by its manifest. Other files of the output directory are left untouched.
+        """
+        output_dir = self.output_dir
+        # A sibling directory, so that files are moved without copies
+        staging_dir = tempfile.mkdtemp(prefix=f'.{os.path.basename(os.path.normpath(output_dir))}-', dir=os.path.dirname(os.path.abspath(output_dir)))
+        self.output_dir = staging_dir
+
+        try:
+            self.generate_code()
+
+            with self.profiler.phase('replace_output'):
+                generated = set()
+                for root, _, files in os.walk(staging_dir):
+                    target_dir = os.path.join(output_dir, os.path.relpath(root, staging_dir))
+                    os.makedirs(target_dir, exist_ok=True)
+                    for name in files:
+                        os.replace(os.path.join(root, name), os.path.join(target_dir, name))
+                        generated.add(os.path.normpath(os.path.join(os.path.relpath(root, staging_dir), name)))
+
+                for path in self.read_manifest(output_dir) - generated:
+                    self.remove_generated_file(output_dir, path)
+                self.write_manifest(output_dir, generated)
+        finally:
+            self.output_dir = output_dir
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def read_manifest(self, output_dir: str) -> set[str]:
+        """
+        Returns the paths of the files written by the previous generation into the output directory.
+        """
+        try:
+            with open(os.path.join(output_dir, MANIFEST_FILE_NAME)) as f:
+                return {line.rstrip('\n') for line in f if line.strip()}
+        except FileNotFoundError:
+            return set()
+
+    def write_manifest(self, output_dir: str, paths: set[str]):
+        with open(os.path.join(output_dir, MANIFEST_FILE_NAME), 'w') as f:
+            f.writelines(f'{path}\n' for path in sorted(paths))
+
+    def remove_generated_file(self, output_dir: str, path: str):
+        # Paths of a tampered manifest never leave the output directory
+        target = os.path.normpath(os.path.join(output_dir, path))
+        if os.path.isabs(path) or path.startswith(os.pardir) or not os.path.isfile(target):
+            return
+
+        os.remove(target)
+        # Directories emptied of generated files, e.g. `mock/`, go with them
+        directory = os.path.dirname(target)
+        while os.path.normpath(directory) != os.path.normpath(output_dir):
+            if os.listdir(directory) == ['__pycache__']:
+                shutil.rmtree(os.path.join(directory, '__pycache__'), ignore_errors=True)
+            if os.listdir(directory):
+                break
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+
+    def generate_code(self):
+        with self.profiler.phase('build_endpoints_code'):
+            endpoints, endpoints_code_grouped_by_tag = self.build_endpoints_code(self.ir.root_endpoints, self.ir.grouped_endpoints)
+
+        with self.profiler.phase('generate_connection_code'):
+            self.generate_connection_code(endpoints)
+        with self.profiler.phase('generate_endpoints_code'):
+            self.generate_endpoints_code(endpoints_code_grouped_by_tag)
+
+        with self.profiler.phase('generate_fields_code'):
+            self.generate_fields_code(self.ir.fields_enums)
+
+        if self.mock:
+            with self.profiler.phase('generate_mock_code'):
+                self.generate_mock_code(endpoints, endpoints_code_grouped_by_tag)
+
+        # Schema classes are built while their module is written
+        with self.profiler.phase('generate_shapes_code'):
+            shape_schemas, _ = self.build_schemas_code(self.ir.shapes, shapes_module=None)
+            # Shapes are named `<nested class name>_<hash>`, the hash is not shown by the classes
+            self.generate_shapes_code(shape_schemas, {shape.name: shape.name.rsplit('_', 1)[0] for shape in self.ir.shapes})
+
+        with self.profiler.phase('generate_requests_code'):
+            request_schemas, request_remain_enums = self.build_schemas_code(self.ir.requests, super_class='ApplaudRequest')
+            self.generate_requests_code(request_schemas)
+
+        with self.profiler.phase('generate_responses_code'):
+            response_schemas, response_remain_enums = self.build_schemas_code(self.ir.responses, super_class='JSONResponse')
+            self.generate_responses_code(response_schemas)
+
+        with self.profiler.phase('generate_models_code'):
+            model_schemas, model_remain_enums = self.build_schemas_code(self.ir.models)
+            self.generate_models_code(model_schemas)
+
+        enums = dict(self.ir.enums)
         enums.update(request_remain_enums)
         enums.update(response_remain_enums)
         enums.update(model_remain_enums)
 
-        self.generate_enums_code(enums)
+        with self.profiler.phase('generate_enums_code'):
+            self.generate_enums_code(enums)
 
     @abstractmethod
     def generate_enums_code(self, enums: list):
@@ -198,15 +228,19 @@ class SDKGenerator(ABC):
         pass
 
     @abstractmethod
-    def generate_models_code(self, models: list):
+    def generate_shapes_code(self, shapes: Iterator[str], names: dict[str, str]):
         pass
 
     @abstractmethod
-    def generate_responses_code(self, responses: list):
+    def generate_models_code(self, models: Iterator[str]):
         pass
 
     @abstractmethod
-    def generate_requests_code(self, requests: list):
+    def generate_responses_code(self, responses: Iterator[str]):
+        pass
+
+    @abstractmethod
+    def generate_requests_code(self, requests: Iterator[str]):
         pass
 
     @abstractmethod
@@ -217,6 +251,10 @@ class SDKGenerator(ABC):
     def generate_endpoints_code(self, grouped_endpoints: dict):
         pass
 
+    @abstractmethod
+    def generate_mock_code(self, endpoints: list, grouped_endpoints: dict):
+        pass
+
     def render_template(self, template_path: str, file_path: str=None, *args: Any, **kwargs: Any):
         if file_path is None:
             file_path = template_path
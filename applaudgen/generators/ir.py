@@ -0,0 +1,191 @@
+"""
+Backend neutral intermediate representation of the App Store Connect specification.
+
+The IR is produced by :py:mod:`applaudgen.generators.parsers`, which performs every structural
+check of the specification, and consumed by the builders of each backend. It is cached on disk
+keyed on the hash of the specification file, so that unchanged specifications are neither parsed
+nor validated again.
+"""
+
+import hashlib, os, pickle, tempfile
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from typing import Optional
+from .. import __version__
+
+# Bump whenever the IR classes or the parsers change in a way that alters the IR
+IR_FORMAT_VERSION = 3
+
+class EndpointType(Enum):
+    ROOT = auto()
+    LINKAGE = auto()
+    LEAF = auto()
+
+@dataclass
+class GetOperation:
+    deprecated: bool
+    response_type: str
+    response_single_instance: bool
+    response_comment: str
+
+@dataclass
+class PostOperation:
+    deprecated: bool
+    response_type: str
+    response_single_instance: bool
+    response_comment: str
+    request_type: str
+    request_single_instance: bool
+    request_comment: str
+
+@dataclass
+class PatchOperation:
+    deprecated: bool
+    response_type: str
+    response_single_instance: bool
+    response_comment: str
+    request_type: str
+    request_single_instance: bool
+    request_comment: str
+
+@dataclass
+class DeleteOperation:
+    deprecated: bool
+    request_type: str
+    request_single_instance: bool
+    request_comment: str
+
+@dataclass
+class Filter:
+    name: str
+    # Specification type of the items (`string`), or name of the enum of the values
+    item_type: str
+    required: bool
+    description: str
+
+@dataclass
+class Limit:
+    # `default-limit` for the `limit` parameter, relationship name for `limit[…]`
+    name: str
+    maximum: int
+    description: str
+
+@dataclass
+class Endpoint:
+    path: str
+    endpoint_type: EndpointType
+    method: str
+    class_name: str
+    has_id_param: bool = False
+    tags: list[str] = field(default_factory=list)
+    # (fields name, description), fields names may repeat
+    fields: list[tuple[str, str]] = field(default_factory=list)
+    fields_enums: dict[str, list[str]] = field(default_factory=dict)
+    exists_names: list[str] = field(default_factory=list)
+    sort_qualifiers: list[str] = field(default_factory=list)
+    filters: list[Filter] = field(default_factory=list)
+    limits: list[Limit] = field(default_factory=list)
+    include_names: list[str] = field(default_factory=list)
+    # Enums embedded in the endpoint class
+    enums: dict[str, list[str]] = field(default_factory=dict)
+    operation_get: Optional[GetOperation] = None
+    operation_post: Optional[PostOperation] = None
+    operation_patch: Optional[PatchOperation] = None
+    operation_delete: Optional[DeleteOperation] = None
+    leaf_endpoints: list['Endpoint'] = field(default_factory=list)
+    linkage_endpoints: list['Endpoint'] = field(default_factory=list)
+
+class TypeKind(Enum):
+    # Specification type and format, e.g. `string` and `date-time`
+    PRIMITIVE = auto()
+    # Schema, enum or nested class
+    NAMED = auto()
+    LIST = auto()
+    UNION = auto()
+    ENTITLEMENTS = auto()
+
+@dataclass(frozen=True)
+class TypeRef:
+    kind: TypeKind
+    name: Optional[str] = None
+    format: Optional[str] = None
+    items: tuple['TypeRef', ...] = ()
+
+@dataclass
+class Attribute:
+    name: str
+    type: TypeRef
+    required: bool
+    # Single allowed value, a string literal or a member of the enum `type`
+    default_value: Optional[str]
+    deprecated: bool
+
+@dataclass
+class EnumSchema:
+    name: str
+    values: list[str]
+
+@dataclass
+class Schema:
+    name: str
+    deprecated: bool = False
+    attributes: list[Attribute] = field(default_factory=list)
+    nested_enums: list[EnumSchema] = field(default_factory=list)
+    nested_classes: list['Schema'] = field(default_factory=list)
+    # Enums referenced by the schema (or its nested classes) which are defined at the top level
+    remain_enums: dict[str, list[str]] = field(default_factory=dict)
+    # Name of the shared shape implementing this nested class, if any
+    shape: Optional[str] = None
+
+@dataclass
+class Spec:
+    # Top level keys of the specification except `paths` and `components`
+    metadata: dict
+    root_endpoints: list[Endpoint]
+    grouped_endpoints: dict[str, list[Endpoint]]
+    fields_enums: dict[str, list[str]]
+    enums: dict[str, list[str]]
+    requests: list[Schema]
+    responses: list[Schema]
+    models: list[Schema]
+    # Implementations shared by structurally identical nested classes, dependencies first
+    shapes: list[Schema]
+    # `components.schemas` of the specification, serialized as JSON
+    schemas_json: bytes
+
+def load(spec_file: str, cache_dir: Optional[str] = None) -> Spec:
+    """
+    Returns the IR of the specification file, from `cache_dir` if it has been parsed before.
+    """
+    from .parsers import SpecParser
+
+    with open(spec_file, 'rb') as f:
+        data = f.read()
+
+    cache_file = None
+    if cache_dir:
+        key = hashlib.sha256(data).hexdigest()
+        cache_file = os.path.join(cache_dir, f'{key}-{IR_FORMAT_VERSION}-{__version__}.pickle')
+
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            # Missing or unreadable cache, parse again
+            pass
+
+    spec = SpecParser(data).parse()
+
+    if cache_file:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Concurrent generators may write the same file, readers only ever see a complete one
+        fd, temp_file = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(spec, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+        except BaseException:
+            os.unlink(temp_file)
+            raise
+
+    return spec
@@ -0,0 +1,31 @@
+from dataclasses import replace
+from .ir import *
+
+class LinksDropper:
+    """
+    Removes the `links` of resources and relationships from the IR, along with the nested classes
+    of their type, so that decoded responses do not hold their URLs.
+
+    The `links` of response documents are kept, they point to the next page.
+    """
+
+    def __init__(self, spec: Spec):
+        self.spec = spec
+
+    def __drop(self, schema: Schema) -> Schema:
+        dropped = [attr for attr in schema.attributes if attr.name == 'links']
+        local_names = {attr.type.name for attr in dropped if attr.type.kind == TypeKind.NAMED}
+
+        return replace(schema,
+                       attributes=[attr for attr in schema.attributes if attr.name != 'links'],
+                       nested_classes=[self.__drop(nested) for nested in schema.nested_classes if nested.name not in local_names])
+
+    def __drop_nested(self, schema: Schema) -> Schema:
+        return replace(schema, nested_classes=[self.__drop(nested) for nested in schema.nested_classes])
+
+    def drop(self) -> Spec:
+        return replace(self.spec,
+                       requests=[self.__drop(schema) for schema in self.spec.requests],
+                       responses=[self.__drop_nested(schema) for schema in self.spec.responses],
+                       models=[self.__drop(schema) for schema in self.spec.models],
+                       shapes=[self.__drop(schema) for schema in self.spec.shapes])
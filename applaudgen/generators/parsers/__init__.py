@@ -0,0 +1,151 @@
+import orjson
+from ..ir import *
+from .endpoint import EndpointParser
+from .schema import SchemaParser
+from .shapes import ShapeDeduplicator
+
+class SpecParser:
+    """
+    Parses and validates the whole specification into the IR consumed by the generators.
+    """
+
+    endpoint_parser_class = EndpointParser
+    schema_parser_class = SchemaParser
+
+    # Models referenced by other models are defined first
+    model_order_keys = ['ResourceLinks', 'PagingInformation', 'HttpHeader', 'ImageAsset', 'AppMediaStateError', 'AppMediaAssetState', 'UploadOperation', 'Device', 'FileLocation', 'ScmProviderType',
+        'CiTagPatterns', 'CiBranchPatterns', 'CiStartConditionFileMatcher', 'CiFilesAndFoldersRule', 'CiTestDestination', 'CiAction', 'CiGitUser', 'CiIssueCounts', 'CapabilityOption', 'CapabilitySetting', 'CiBranchStartCondition', 'CiTagStartCondition', 'CiPullRequestStartCondition', 'CiScheduledStartCondition']
+
+    def __init__(self, data: bytes):
+        self.spec = orjson.loads(data)
+
+    def parse(self) -> Spec:
+        root_endpoints, grouped_endpoints, fields_enums = self.parse_endpoints(self.spec['paths'])
+        enums = {}
+        requests = {}
+        responses = {}
+        models = {}
+
+        for key, value in self.spec['components']['schemas'].items():
+            if 'enum' in value:
+                # Enums
+                assert value['type'] == 'string', f'Enum {key} is not a string'
+                enums[key] = value['enum']
+            elif value["type"] == "object":
+                # Dataclasses
+                if key.endswith('Request'):
+                    # Request dataclasses
+                    requests[key] = value
+                elif key.endswith('Response'):
+                    # Response dataclasses
+                    responses[key] = value
+                else:
+                    models[key] = value
+            else:
+                assert False, f'Unknown type ({value["type"]}) in schemas!'
+
+        metadata = {key: value for key, value in self.spec.items() if key not in ['paths', 'components']}
+        request_schemas = self.parse_schemas(requests)
+        response_schemas = self.parse_schemas(responses)
+        model_schemas = self.parse_schemas(models, order_keys=self.model_order_keys, in_models=True)
+
+        all_schemas = request_schemas + response_schemas + model_schemas
+        enum_names = set(enums).union(*(schema.remain_enums for schema in all_schemas))
+        shapes = ShapeDeduplicator(all_schemas, enum_names).deduplicate()
+
+        return Spec(metadata, root_endpoints, grouped_endpoints, fields_enums, enums, request_schemas, response_schemas, model_schemas, shapes,
+                    orjson.dumps(self.spec['components']['schemas']))
+
+    def parse_schemas(self, definitions: dict, *, order_keys: list = [], in_models: bool = False) -> list[Schema]:
+        sorted_keys = order_keys + [key for key in definitions.keys() if key not in order_keys]
+        return [self.schema_parser_class(key, definitions[key], in_models).parse() for key in sorted_keys]
+
+    def parse_endpoints(self, paths: dict) -> tuple[list, dict, dict]:
+        not_allowed_operations = ['put', 'options', 'head', 'trace']
+        allowed_operations = ['get', 'post', 'delete', 'patch']
+
+        root_endpoints: list[Endpoint] = []
+        leaf_endpoints: list[Endpoint] = []
+        linkage_endpoints: list[Endpoint] = []
+        endpoints_grouped_by_tag = {}
+
+        def create_and_add_dummy_root(dummy_path: str, child: Endpoint, leaf: bool):
+            dummy = self.create_dummy_endpoint(dummy_path)
+            dummy.leaf_endpoints.append(child) if leaf else dummy.linkage_endpoints.append(child)
+            tag = child.tags[0]
+
+            root_endpoints.append(dummy)
+            endpoints_grouped_by_tag[tag] = endpoints_grouped_by_tag.get(tag, []) + [dummy]
+
+
+        for path, spec in paths.items():
+            assert all(key not in not_allowed_operations for key in spec.keys()), f'Contains unknown operation method ({spec.keys()}) in path {path}'
+
+            # Only 'get', 'post', 'delete', 'patch' and 'parameters' are handled
+            assert all(key in allowed_operations + ['parameters'] for key in spec.keys()), f'Contains unknown key ({spec.keys()}) in path {path}'
+
+            endpoint = self.endpoint_parser_class(path, spec).parse()
+
+            # Skip paths that do not have any allowed operations
+            if all(key not in allowed_operations for key in spec.keys()):
+                print(f'Found dummy endpoint {path}')
+                tag = 'dummy'
+            else:
+                if endpoint.endpoint_type == EndpointType.ROOT:
+                    root_endpoints.append(endpoint)
+                elif endpoint.endpoint_type == EndpointType.LEAF:
+                    leaf_endpoints.append(endpoint)
+                elif endpoint.endpoint_type == EndpointType.LINKAGE:
+                    linkage_endpoints.append(endpoint)
+                else:
+                    raise ValueError(f'Unknown endpoint type {endpoint.endpoint_type}')
+
+                tag = endpoint.tags[0]
+
+            endpoints_grouped_by_tag[tag] = endpoints_grouped_by_tag.get(tag, []) + [endpoint]
+
+        for leaf_endpoint in leaf_endpoints:
+            root_endpoint = next(iter(filter(lambda root: leaf_endpoint.path.startswith(root.path) and root.has_id_param, root_endpoints)), None)
+
+            if not root_endpoint:
+                dumy_path = '/'.join(leaf_endpoint.path.split('/')[:4])
+                print(f'Missing id endpoint for leaf endpoint {leaf_endpoint.path}, create dummy id endpoint {dumy_path}')
+                create_and_add_dummy_root(dumy_path, leaf_endpoint, True)
+            else:
+                root_endpoint.leaf_endpoints.append(leaf_endpoint)
+
+        for linkage_endpoint in linkage_endpoints:
+            root_endpoint = next(iter(filter(lambda root: linkage_endpoint.path.startswith(root.path) and root.has_id_param, root_endpoints)), None)
+
+            if not root_endpoint:
+                dumy_path = '/'.join(linkage_endpoint.path.split('/')[:4])
+                print(f'Missing id endpoint for linkage endpoint {linkage_endpoint.path}, create dummy id endpoint {dumy_path}')
+                create_and_add_dummy_root(dumy_path, leaf_endpoint, False)
+            else:
+                root_endpoint.linkage_endpoints.append(linkage_endpoint)
+
+        # Generate Endpoint Field enums
+        all_fields_enums = {}
+        for endpoint in root_endpoints + leaf_endpoints + linkage_endpoints:
+            for name, value in endpoint.fields_enums.items():
+                if name in all_fields_enums:
+                    assert all_fields_enums[name] == value, f'Field {name} is defined twice with different values'
+                else:
+                    all_fields_enums[name] = value
+
+        return root_endpoints, endpoints_grouped_by_tag, all_fields_enums
+
+    def create_dummy_endpoint(self, path: str) -> Endpoint:
+        spec = {
+            "parameters" : [ {
+                "name" : "id",
+                "in" : "path",
+                "description" : "the id of the requested resource",
+                "schema" : {
+                "type" : "string"
+                },
+                "style" : "simple",
+                "required" : True
+            } ]
+        }
+        return self.endpoint_parser_class(path, spec).parse()
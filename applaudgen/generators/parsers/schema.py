@@ -0,0 +1,190 @@
+from typing import Optional
+from ..ir import *
+from ..utils import *
+
+class SchemaParser:
+    """
+    Parses and validates an object schema of the specification into a :py:class:`Schema`.
+    """
+
+    _trace_enum_map = {
+        'Device.Attributes.DeviceClass':    'DeviceClass',
+        'Device.Attributes.Status':         'DeviceStatus',
+        'AgeRatingDeclaration.Attributes.AlcoholTobaccoOrDrugUseOrReferences': 'AgeRatingDeclarationLevel',
+        'AgeRatingDeclaration.Attributes.Contests':                         'AgeRatingDeclarationLevel',
+        'AgeRatingDeclaration.Attributes.GamblingSimulated':                'AgeRatingDeclarationLevel',
+        'AgeRatingDeclaration.Attributes.MedicalOrTreatmentInformation':    'AgeRatingDeclarationLevel',
+        'AgeRatingDeclaration.Attributes.ProfanityOrCrudeHumor':            'AgeRatingDeclarationLevel',
+        'AgeRatingDeclaration.Attributes.SexualContentGraphicAndNudity':    'AgeRatingDeclarationLevel',
+        'AgeRatingDeclaration.Attributes.SexualContentOrNudity':            'AgeRatingDeclarationLevel',
+        'AgeRatingDeclaration.Attributes.HorrorOrFearThemes':               'AgeRatingDeclarationLevel',
+        'AgeRatingDeclaration.Attributes.MatureOrSuggestiveThemes':         'AgeRatingDeclarationLevel',
+        'AgeRatingDeclaration.Attributes.ViolenceCartoonOrFantasy':         'AgeRatingDeclarationLevel',
+        'AgeRatingDeclaration.Attributes.ViolenceRealisticProlongedGraphicOrSadistic': 'AgeRatingDeclarationLevel',
+        'AgeRatingDeclaration.Attributes.ViolenceRealistic':    'AgeRatingDeclarationLevel',
+        'AppClipAdvancedExperience.Attributes.Status':          'AppClipAdvancedExperienceStatus',
+        'AppClipAdvancedExperience.Attributes.PlaceStatus':     'AppClipAdvancedExperiencePlaceStatus',
+        'AppClipAdvancedExperience.Attributes.BusinessCategory': 'AppClipAdvancedExperienceBusinessCategory',
+        'AppClipDomainStatus.Attributes.Domain.ErrorCode':      'AppClipDomainErrorCode',
+        'AppStoreVersion.Attributes.ReleaseType':               'AppStoreVersionReleaseType',
+        'App.Attributes.ContentRightsDeclaration':              'AppContentRightsDeclaration',
+        'BuildBundle.Attributes.BundleType':                    'BuildBundleType',
+        'Build.Attributes.ProcessingState':                     'BuildProcessingState',
+        'CiArtifact.Attributes.FileType':                       'CiArtifactFileType',
+        'CiBuildRun.Attributes.StartReason':                    'CiBuildRunStartReason',
+        'CiBuildRun.Attributes.CancelReason':                   'CiBuildRunCancelReason',
+        'CiIssue.Attributes.IssueType':                         'CiIssueType',
+        'CiProduct.Attributes.ProductType':                     'CiProductType',
+        'InAppPurchase.Attributes.InAppPurchaseType':           'InAppPurchaseType',
+        'InAppPurchase.Attributes.State':                       'InAppPurchaseState',
+        'PerfPowerMetric.Attributes.MetricType':                'PerfPowerMetricType',
+        'Profile.Attributes.ProfileType':                       'ProfileType',
+        'Profile.Attributes.ProfileState':                      'ProfileState',
+        'AppClipAdvancedExperience.Attributes.Place.DisplayPoint.Source': 'AppClipAdvancedExperiencePlaceSource',
+        'AppClipAdvancedExperience.Attributes.Place.MapAction':     'AppClipAdvancedExperiencePlaceMapAction',
+        'AppClipAdvancedExperience.Attributes.Place.Relationship':  'AppClipAdvancedExperiencePlaceRelationship',
+        'AppClipAdvancedExperience.Attributes.Place.PhoneNumber.Type': 'AppClipAdvancedExperiencePlacePhoneNumberType',
+        'PerfPowerMetric.Attributes.Platform':                  'PerfPowerMetricPlatform',
+        'DiagnosticSignature.Attributes.DiagnosticType':        'DiagnosticType',
+    }
+
+    def __init__(self, name: str, fields: dict, is_model_class: bool=False, parent: str=None) -> None:
+        self.name = name
+        self.fields = fields
+        self.is_model_class = is_model_class
+        self.parent = parent
+
+        self.attributes = []
+        self.nested_enums = []
+        self.nested_classes = []
+        self.remain_enums = {}
+
+    def model_internal_class_name(self, name) -> str:
+        if name == 'businessCategory':
+            return 'AppClipAdvancedExperienceBusinessCategory'
+        elif name == 'releaseType':
+            return 'AppStoreVersionReleaseType'
+        elif name == 'contentRightsDeclaration':
+            return 'AppContentRightsDeclaration'
+        elif name == 'status':
+            return 'DeviceStatus'
+        elif name == 'profileType':
+            return 'ProfileType'
+        
+        return None
+
+    def external_enum_name(self, enum) -> str:
+        if enum == ["NONE", "INFREQUENT_OR_MILD", "FREQUENT_OR_INTENSE"]:
+            # defined in enums.py.jinja
+            return 'AgeRatingDeclarationLevel'
+
+        return None
+
+    def __parse_property_type(self, property_name: str, property_dict: dict) -> tuple[TypeRef, Optional[str], bool]:
+        deprecated = property_dict.get('deprecated', False)
+
+        if '$ref' in property_dict:
+            return (TypeRef(TypeKind.NAMED, property_dict['$ref'].split('/')[-1]), None, deprecated)
+        else:
+            default_value = None
+            property_type = property_dict.get('type', None)
+            parent_name = f'{self.parent}.{self.name}' if self.parent else self.name
+
+            if property_type == 'string' and 'enum' in property_dict:
+                enum = property_dict['enum']
+                if len(enum) == 1 and property_name == 'type':
+                    # type is a single enum value
+                    default_value = enum[0]
+                    type_ref = TypeRef(TypeKind.PRIMITIVE, property_type)
+                else:
+                    possible_model_internal_class_name = self.model_internal_class_name(property_name)
+                    possile_external_enum_name = self.external_enum_name(enum)
+
+                    if not self.is_model_class and (possible_model_internal_class_name or possile_external_enum_name):
+                        property_type = possible_model_internal_class_name or possile_external_enum_name
+                    else:
+                        property_type = capfirst(property_name)
+                        trace = f'{parent_name}.{property_type}'
+                        if trace in self._trace_enum_map:
+                            property_type = self._trace_enum_map[trace]
+                            self.remain_enums[property_type] = enum
+                        else:
+                            self.nested_enums.append(EnumSchema(property_type, enum))
+
+                    if len(enum) == 1:
+                        # enum is a single value
+                        default_value = enum[0]
+                    type_ref = TypeRef(TypeKind.NAMED, property_type)
+            elif property_type == 'object':
+                if property_name == "place" and not self.is_model_class:
+                    type_ref = TypeRef(TypeKind.NAMED, "AppClipAdvancedExperience.Attributes.Place")
+                elif property_name == "entitlements":
+                    type_ref = TypeRef(TypeKind.ENTITLEMENTS)
+                elif 'properties' in property_dict:
+                    sub_class_parser = self.__class__(capfirst(property_name), property_dict, self.is_model_class, parent_name)
+                    self.nested_classes.append(sub_class_parser.parse())
+                    self.remain_enums.update(sub_class_parser.remain_enums)
+                    type_ref = TypeRef(TypeKind.NAMED, capfirst(property_name))
+                else:
+                    assert False, f'Cannot handle type ({property_type}) in class {self.name}'
+            elif property_type == 'array':
+                items = property_dict['items']
+                item_type = items.get('type', None)
+
+                if item_type == 'object':
+                    item_type_name = capfirst(simple_singular(property_name))
+                    item_class_parser = self.__class__(item_type_name, items, self.is_model_class, parent_name)
+                    self.nested_classes.append(item_class_parser.parse())
+                    self.remain_enums.update(item_class_parser.remain_enums)
+                    item_ref = TypeRef(TypeKind.NAMED, item_type_name)
+                elif item_type == 'string':
+                    item_ref = TypeRef(TypeKind.PRIMITIVE, 'string')
+                elif '$ref' in items:
+                    '''
+                    "items" : {
+                        "$ref" : "#/components/schemas/AppClipDefaultExperienceLocalization"
+                    }
+                    '''
+                    item_ref = TypeRef(TypeKind.NAMED, items['$ref'].split('/')[-1])
+                elif 'oneOf' in items:
+                    '''
+                    "items" : {
+                        "oneOf" : [ {
+                            "$ref" : "#/components/schemas/AppClipDefaultExperience"
+                        },
+                        …
+                    }
+                    '''
+                    # included field, discriminator is `type` attribute of contained object
+                    item_ref = TypeRef(TypeKind.UNION, items=tuple(TypeRef(TypeKind.NAMED, ref['$ref'].split('/')[-1]) for ref in items['oneOf'] if '$ref' in ref))
+                else:
+                    assert False, f'Not supported array type ({items}) in class {self.name}'
+                type_ref = TypeRef(TypeKind.LIST, items=(item_ref,))
+            elif 'oneOf' in property_dict:
+                # ErrroResponse.source, no discriminator
+                type_ref = TypeRef(TypeKind.UNION, items=tuple(TypeRef(TypeKind.NAMED, ref['$ref'].split('/')[-1]) for ref in property_dict['oneOf'] if '$ref' in ref))
+            else:
+                type_ref = TypeRef(TypeKind.PRIMITIVE, property_type, property_dict.get('format', None))
+
+            return (type_ref, default_value, deprecated)
+
+    def parse(self) -> Schema:
+        allowed_field_keys = ['type', 'title', 'required', 'properties', 'deprecated']
+
+        # Check keys to make sure we have handled all types in classes
+        assert all(field_key in allowed_field_keys for field_key in self.fields.keys()), f'Contains unknown field key ({self.fields.keys()}) in class {self.name}'
+        
+        deprecated = self.fields.get('deprecated', False)
+        properties = self.fields['properties']
+        required_property_names = self.fields['required'] if 'required' in self.fields else []
+
+        sorted_property_names = required_property_names + [name for name in properties.keys() if name not in required_property_names]
+
+        for property_name in sorted_property_names:
+            property_dict = properties[property_name]
+            is_required = property_name in required_property_names
+
+            type_ref, default_value, is_deprecated = self.__parse_property_type(property_name, property_dict)
+            self.attributes.append(Attribute(property_name, type_ref, is_required, default_value, is_deprecated))
+
+        return Schema(self.name, deprecated, self.attributes, self.nested_enums, self.nested_classes, self.remain_enums)
@@ -0,0 +1,115 @@
+import hashlib
+from collections import Counter
+from dataclasses import replace
+from ..ir import *
+
+class ShapeDeduplicator:
+    """
+    Finds nested classes that are structurally identical (`Relationships.App.Data`, `Links` …) and
+    assigns them a shared shape.
+
+    Only self-contained nested classes are shared, i.e. those whose types resolve to their own nested
+    classes and enums or to top level enums, so that shapes do not depend on any schema.
+    """
+
+    # Stop refining shared shapes after this many passes
+    max_passes = 10
+
+    def __init__(self, schemas: list[Schema], enum_names: set[str]):
+        self.schemas = schemas
+        self.enum_names = enum_names
+        self.keys: dict[int, tuple] = {}
+        self.heights: dict[tuple, int] = {}
+        self.self_contained: dict[tuple, bool] = {}
+        self.first_occurrences: dict[tuple, Schema] = {}
+
+    def __key(self, schema: Schema) -> tuple:
+        # Only nested classes of the same name share a shape, which is named after them
+        nested_keys = tuple((nested.name, self.__key(nested)) for nested in schema.nested_classes)
+        key = (schema.name, schema.deprecated,
+               tuple((attr.name, attr.type, attr.required, attr.default_value, attr.deprecated) for attr in schema.attributes),
+               tuple((enum.name, tuple(enum.values)) for enum in schema.nested_enums),
+               nested_keys)
+
+        self.keys[id(schema)] = key
+        if key not in self.heights:
+            self.heights[key] = 1 + max((self.heights[nested_key] for _, nested_key in nested_keys), default=0)
+            self.self_contained[key] = self.__is_self_contained(schema, nested_keys)
+
+        return key
+
+    def __is_self_contained(self, schema: Schema, nested_keys: tuple) -> bool:
+        local_names = {nested.name for nested in schema.nested_classes} | {enum.name for enum in schema.nested_enums}
+
+        def resolves(type: TypeRef) -> bool:
+            if type.kind == TypeKind.NAMED:
+                return type.name in local_names or type.name in self.enum_names
+            return all(resolves(item) for item in type.items)
+
+        return all(resolves(attr.type) for attr in schema.attributes) and all(self.self_contained[nested_key] for _, nested_key in nested_keys)
+
+    def __count(self, shared: set) -> Counter:
+        # Occurrences of nested classes once shared shapes are deduplicated
+        counts = Counter()
+        visited = set()
+
+        def visit(schema: Schema):
+            for nested in schema.nested_classes:
+                key = self.keys[id(nested)]
+                counts[key] += 1
+                self.first_occurrences.setdefault(key, nested)
+
+                if key in shared:
+                    if key in visited:
+                        continue
+                    visited.add(key)
+
+                visit(nested)
+
+        for schema in self.schemas:
+            visit(schema)
+
+        return counts
+
+    def __assign(self, schema: Schema, names: dict):
+        for nested in schema.nested_classes:
+            key = self.keys[id(nested)]
+            if key in names:
+                nested.shape = names[key]
+            self.__assign(nested, names)
+
+    def deduplicate(self) -> list[Schema]:
+        """
+        Marks the shared nested classes with their shape and returns the shapes, dependencies first.
+        """
+        for schema in self.schemas:
+            self.__key(schema)
+
+        counts = self.__count(set())
+        candidates = {key for key, count in counts.items() if count >= 2 and self.self_contained[key]}
+
+        shared = candidates
+        for _ in range(self.max_passes):
+            counts = self.__count(shared)
+            refined = {key for key in candidates if counts[key] >= 2}
+            if refined == shared:
+                break
+            shared = refined
+
+        order = {key: n for n, key in enumerate(self.first_occurrences)}
+        sorted_keys = sorted(shared, key=lambda key: (self.heights[key], order[key]))
+
+        names = {}
+        for key in sorted_keys:
+            digest = hashlib.sha256(repr(key).encode()).hexdigest()[:8]
+            names[key] = f'{self.first_occurrences[key].name}_{digest}'
+
+        for schema in self.schemas:
+            self.__assign(schema, names)
+
+        shapes = []
+        for key in sorted_keys:
+            shape = replace(self.first_occurrences[key], name=names[key], shape=None)
+            shapes.append(shape)
+
+        return shapes
@@ -1,7 +1,9 @@
 import os
-from typing import Union
+from typing import Iterator, Optional, Union
 from .utils import *
+from .. import __version__
 from . import SDKGenerator, SchemaClassBuilder, EndpointClassBuilder
+from .ir import TypeRef, TypeKind
 
 def _canonical_type_code(type: str, format: str = None) -> str:
     if type == 'string':
@@ -53,19 +55,8 @@ class PythonSchemaClassBuilder(SchemaClassBuilder):
 
         return f'{name}: Literal[{default_value}] = {default_value}'
 
-    def model_internal_class_name(self, name) -> str:
-        if name == 'businessCategory':
-            return 'AppClipAdvancedExperienceBusinessCategory'
-        elif name == 'releaseType':
-            return 'AppStoreVersionReleaseType'
-        elif name == 'contentRightsDeclaration':
-            return 'AppContentRightsDeclaration'
-        elif name == 'status':
-            return 'DeviceStatus'
-        elif name == 'profileType':
-            return 'ProfileType'
-        
-        return None
+    def build_alias_code(self, name: str, target: str) -> str:
+        return f'{name} = {target}\n'
 
     def union_type_code(self, union_types: list) -> str:
         return f"Union[{', '.join(union_types)}]"
@@ -78,13 +69,146 @@ class PythonSchemaClassBuilder(SchemaClassBuilder):
 
         return f'list[{canonical_type}]'
 
-    def external_enum_name(self, enum) -> str:
-        if enum == ["NONE", "INFREQUENT_OR_MILD", "FREQUENT_OR_INTENSE"]:
-            # defined in enums.py.jinja
-            return 'AgeRatingDeclarationLevel'
+class NativePythonSchemaClassBuilder(PythonSchemaClassBuilder):
+    """
+    Builds slotted classes with straight-line `parse_obj()` and `request_dict()` methods instead of pydantic models.
+    """
+
+    template_name = 'schemas/native_class.py'
+
+    _date_parsers = {'date-time': 'parse_datetime', 'date': 'parse_date', 'time': 'parse_time'}
+
+    def canonical_type_code(self, type: str, format: str = None) -> str:
+        # Emails and URLs are not validated
+        return 'str' if format in ['email', 'uri'] else _canonical_type_code(type, format)
+
+    def build_attribute_code(self, name: str, type: str, is_required: bool, default_value: str, is_deprecated: bool) -> str:
+        # Annotations only, values would conflict with the slots
+        name = snake_case(name)
+
+        if default_value is None:
+            return f'{name}: {type}' if is_required else f'{name}: Optional[{type}]'
+
+        return f'{name}: Literal[{default_value}]'
+
+    def __is_local(self, name: str) -> bool:
+        return any(nested.name == name for nested in self.schema.nested_classes) or any(enum.name == name for enum in self.schema.nested_enums)
+
+    def __is_enum(self, name: str) -> bool:
+        return any(enum.name == name for enum in self.schema.nested_enums) or (not self.__is_local(name) and name in self.enum_names)
+
+    def __ref(self, name: str) -> str:
+        # Nested classes are not in the scope of methods
+        return f'cls.{name}' if self.__is_local(name) else name
+
+    def decoder_code(self, type: TypeRef, attr_name: str) -> Optional[str]:
+        """
+        Returns the callable decoding a JSON value of `type`, None if the JSON value is kept as is.
+        """
+        if type.kind == TypeKind.PRIMITIVE:
+            return self._date_parsers.get(type.format) if type.name == 'string' else None
+        elif type.kind == TypeKind.NAMED:
+            return f'{self.__ref(type.name)}._value2member_map_.__getitem__' if self.__is_enum(type.name) else f'{self.__ref(type.name)}.parse_obj'
+        elif type.kind == TypeKind.UNION:
+            return f'cls._parse_{attr_name}'
+
+        assert type.kind == TypeKind.ENTITLEMENTS, f'Unhandled type ({type.kind}) in class {self.name}'
+        return None
+
+    def decode_code(self, type: TypeRef, attr_name: str, value: str) -> Optional[str]:
+        if type.kind == TypeKind.NAMED and self.__is_enum(type.name):
+            return f'{self.__ref(type.name)}._value2member_map_[{value}]'
+        elif type.kind == TypeKind.LIST:
+            decoder = self.decoder_code(type.items[0], attr_name)
+            return decoder and f'list(map({decoder}, {value}))'
+
+        decoder = self.decoder_code(type, attr_name)
+        return decoder and f'{decoder}({value})'
+
+    def encode_code(self, type: TypeRef, value: str) -> Optional[str]:
+        """
+        Returns the expression encoding `value` of `type` into JSON, None if it is encoded as is.
+        """
+        if type.kind == TypeKind.PRIMITIVE:
+            return f'{value}.isoformat()' if type.name == 'string' and type.format in self._date_parsers else None
+        elif type.kind == TypeKind.NAMED:
+            return None if self.__is_enum(type.name) else f'{value}.request_dict()'
+        elif type.kind == TypeKind.UNION:
+            return f'{value}.request_dict()'
+        elif type.kind == TypeKind.LIST:
+            item = self.encode_code(type.items[0], 'item')
+            return item and f'[{item} for item in {value}]'
 
         return None
 
+    def build_context(self, super_class: Optional[str] = None, indent: str = '') -> dict:
+        context = super().build_context(super_class, indent)
+        params = []
+        decode_lines = []
+        encode_lines = []
+        unions = []
+        type_literal = None
+
+        for attr in self.schema.attributes:
+            name = snake_case(attr.name)
+            key = repr(attr.name)
+            default = self.default_value_code(attr.type, attr.default_value)
+
+            union = attr.type if attr.type.kind == TypeKind.UNION else attr.type.items[0] if attr.type.kind == TypeKind.LIST and attr.type.items[0].kind == TypeKind.UNION else None
+            if union:
+                unions.append((name, [item.name for item in union.items]))
+
+            if default is not None:
+                # Literals, e.g. the `type` of resources
+                params.append(f'{name}={default}')
+                value = f'cls.{default}' if attr.type.kind == TypeKind.NAMED and self.__is_local(attr.type.name) else default
+                decode_lines.append(f'if obj.get({key}, {value}) != {value}: raise ValueError({f"{attr.name} must be {attr.default_value!r}"!r})')
+                decode_lines.append(f'self.{name} = {value}')
+                encode_lines.append(f'result[{key}] = self.{name}')
+                if attr.name == 'type':
+                    type_literal = default
+                continue
+
+            params.append(name if attr.required else f'{name}=None')
+            if attr.required:
+                decode = self.decode_code(attr.type, name, f'obj[{key}]')
+                decode_lines.append(f'self.{name} = {decode or f"obj[{key}]"}')
+            else:
+                decode = self.decode_code(attr.type, name, 'value')
+                if decode:
+                    decode_lines.append(f'value = obj.get({key})')
+                    decode_lines.append(f'self.{name} = None if value is None else {decode}')
+                else:
+                    decode_lines.append(f'self.{name} = obj.get({key})')
+
+            encode = self.encode_code(attr.type, 'value')
+            encode_lines.append(f'value = self.{name}')
+            encode_lines.append(f'if value is not None: result[{key}] = {encode or "value"}')
+
+        context.update(
+            slots=[snake_case(attr.name) for attr in self.schema.attributes],
+            slots_code=repr(tuple(snake_case(attr.name) for attr in self.schema.attributes)),
+            type_literal=type_literal,
+            unions=unions,
+            params=params,
+            decode_lines=decode_lines,
+            encode_lines=encode_lines
+        )
+        return context
+
+class CompactPythonSchemaClassBuilder(NativePythonSchemaClassBuilder):
+    """
+    Builds native classes interning the `id` of resource identifiers, which repeat across the related
+    resources of large responses.
+    """
+
+    _identifier_attributes = {'type', 'id', 'meta'}
+
+    def decode_code(self, type: TypeRef, attr_name: str, value: str) -> Optional[str]:
+        if attr_name == 'id' and type.kind == TypeKind.PRIMITIVE and {attr.name for attr in self.schema.attributes} <= self._identifier_attributes:
+            return f'intern({value})'
+        return super().decode_code(type, attr_name, value)
+
 class PythonEndpointClassBuilder(EndpointClassBuilder):
 
     fields_function_template_name = 'endpoints/fields_function.py'
@@ -110,26 +234,55 @@ class PythonSDKGenerator(SDKGenerator):
     requests_template_name = 'schemas/requests.py'
     responses_template_name = 'schemas/responses.py'
     models_template_name = 'schemas/models.py'
+    shapes_template_name = 'schemas/shapes.py'
     connection_template_name = 'connection.py'
     endpoint_template_name = 'endpoints/class.py'
     endpoint_package_template_name = 'endpoints/package.py'
     endpoint_base_template_name = 'endpoints/base.py'
     fields_template_name = 'fields.py'
+    instrumentation_template_name = 'instrumentation.py'
+    usage_template_name = 'usage.py'
+    transport_template_name = 'transport.py'
+    concurrency_template_name = 'concurrency.py'
+    cancellation_template_name = 'cancellation.py'
+    mirror_template_name = 'mirror.py'
+    planner_template_name = 'planner.py'
+    export_template_name = 'export.py'
+    main_template_name = '__main__.py'
+    mock_package_template_name = 'mock/__init__.py'
+    mock_server_template_name = 'mock/server.py'
+    mock_load_template_name = 'mock/load.py'
+    benchmarks_template_name = 'benchmarks.py'
 
     schema_class_builder_class = PythonSchemaClassBuilder
     endpoint_class_builder_class = PythonEndpointClassBuilder
+    models_backend = 'pydantic'
 
-    def generate(self):
+    def generate_code(self):
         dump_dir = os.path.join(self.output_dir, "schemas")
         os.makedirs(dump_dir, exist_ok=True)
-        self.render_template(self.spec_template_name, self.spec_template_name, spec=self.spec)
-        return super().generate()
+
+        with self.profiler.phase('generate_package_code'):
+            self.render_template(self.spec_template_name, self.spec_template_name, spec=self.ir.metadata, generator_version=__version__)
+            self.render_template(self.instrumentation_template_name)
+            self.render_template(self.usage_template_name)
+            self.render_template(self.transport_template_name)
+            self.render_template(self.concurrency_template_name)
+            self.render_template(self.cancellation_template_name)
+            self.render_template(self.export_template_name)
+            self.render_template(self.main_template_name)
+
+            if self.benchmarks:
+                self.render_template(self.benchmarks_template_name, models_backend=self.models_backend)
+        return super().generate_code()
 
     def tag_file_name(self, tag: str) -> str:
         return f'{snake_case(tag)}.py'
     
     def generate_connection_code(self, endpoints: list):
         self.render_template(self.connection_template_name, endpoints=endpoints)
+        self.render_template(self.mirror_template_name, endpoints=endpoints)
+        self.render_template(self.planner_template_name, endpoints=endpoints)
 
     def generate_endpoints_code(self, grouped_endpoints: dict):
         dump_dir = os.path.join(self.output_dir, "endpoints")
@@ -139,7 +292,9 @@ class PythonSDKGenerator(SDKGenerator):
         for tag, endpoints in grouped_endpoints.items():
             grouped_tag_file_name = self.tag_file_name(tag)
             
-            self.render_template(self.endpoint_template_name, os.path.join("endpoints", grouped_tag_file_name), endpoints=endpoints)
+            self.render_template(self.endpoint_template_name, os.path.join("endpoints", grouped_tag_file_name), endpoints=endpoints, stub=False)
+            # Typed signatures of the table driven query builder methods
+            self.render_template(self.endpoint_template_name, os.path.join("endpoints", grouped_tag_file_name + 'i'), endpoints=endpoints, stub=True)
 
             grouped_tag_module_name = grouped_tag_file_name.replace('.py', '')
             statements.append(f'from .{grouped_tag_module_name} import *')
@@ -147,19 +302,66 @@ class PythonSDKGenerator(SDKGenerator):
         self.render_template(self.endpoint_package_template_name, os.path.join("endpoints", '__init__.py'), statements=statements)
         self.render_template(self.endpoint_base_template_name)
 
+    def generate_mock_code(self, endpoints: list, grouped_endpoints: dict):
+        dump_dir = os.path.join(self.output_dir, "mock")
+        os.makedirs(dump_dir, exist_ok=True)
+
+        self.render_template(self.mock_package_template_name)
+        self.render_template(self.mock_server_template_name, routes=self.build_mock_routes(grouped_endpoints))
+        self.render_template(self.mock_load_template_name, endpoints=endpoints)
+
+        with open(os.path.join(dump_dir, 'schemas.json'), 'wb') as f:
+            f.write(self.ir.schemas_json)
+
     def generate_fields_code(self, fields_enums: dict):
         self.render_template(self.fields_template_name, fields_enums=fields_enums)
 
     # Schemas
 
-    def generate_models_code(self, schemas: list):
-        self.render_template(self.models_template_name, schemas=schemas)
+    def generate_shapes_code(self, schemas: Iterator[str], names: dict[str, str]):
+        self.render_template(self.shapes_template_name, schemas=schemas, names=names, models_backend=self.models_backend)
+
+    def generate_models_code(self, schemas: Iterator[str]):
+        self.render_template(self.models_template_name, schemas=schemas, models_backend=self.models_backend)
 
     def generate_enums_code(self, enums: list):
         self.render_template(self.enums_template_name, enums=enums)
 
-    def generate_responses_code(self, schemas: list):
-        self.render_template(self.responses_template_name, schemas=schemas)
+    def generate_responses_code(self, schemas: Iterator[str]):
+        self.render_template(self.responses_template_name, schemas=schemas, models_backend=self.models_backend)
+
+    def generate_requests_code(self, schemas: Iterator[str]):
+        self.render_template(self.requests_template_name, schemas=schemas, models_backend=self.models_backend)
+
+class NativePythonSDKGenerator(PythonSDKGenerator):
+    """
+    Generates the schemas as slotted classes with generated decoders and encoders instead of pydantic models,
+    with the same class names and attributes.
+    """
+
+    native_template_name = 'schemas/native.py'
+
+    schema_class_builder_class = NativePythonSchemaClassBuilder
+    models_backend = 'native'
+
+    def generate_code(self):
+        os.makedirs(os.path.join(self.output_dir, "schemas"), exist_ok=True)
+
+        with self.profiler.phase('generate_package_code'):
+            self.render_template(self.native_template_name)
+        return super().generate_code()
+
+class CompactPythonSDKGenerator(NativePythonSDKGenerator):
+    """
+    Generates native schema classes sharing the strings of the ids of related resources.
+    """
+
+    schema_class_builder_class = CompactPythonSchemaClassBuilder
+    models_backend = 'compact'
 
-    def generate_requests_code(self, schemas: list):
-        self.render_template(self.requests_template_name, schemas=schemas)
+# Generators by implementation of the schema classes
+GENERATORS = {
+    'pydantic': PythonSDKGenerator,
+    'native': NativePythonSDKGenerator,
+    'compact': CompactPythonSDKGenerator,
+}
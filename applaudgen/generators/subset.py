@@ -0,0 +1,118 @@
+from dataclasses import replace
+from fnmatch import fnmatchcase
+from typing import Optional
+from .ir import *
+
+class SubsetSelector:
+    """
+    Selects the endpoints of some tags or paths from the IR, with the transitive closure of the
+    request, response and model schemas, shapes, enums and fields enums they reference.
+
+    The root endpoints of the selected leaf and linkage endpoints are kept to reach them from the
+    connection, without their own operations and query parameters unless they are selected too.
+    """
+
+    # Schemas referenced by the templates
+    required_schemas = ['ErrorResponse']
+
+    def __init__(self, spec: Spec, *, tags: Optional[list[str]] = None, paths: Optional[list[str]] = None):
+        self.spec = spec
+        self.tags = tags or []
+        self.paths = paths or []
+
+        unknown_tags = [tag for tag in self.tags if tag not in spec.grouped_endpoints]
+        if unknown_tags:
+            raise ValueError(f'Unknown tags {", ".join(unknown_tags)}, available tags are {", ".join(sorted(spec.grouped_endpoints))}')
+
+    def __is_selected(self, tag: str, endpoint: Endpoint) -> bool:
+        return tag in self.tags or any(fnmatchcase(endpoint.path, pattern) for pattern in self.paths)
+
+    def select_endpoints(self) -> tuple[list[Endpoint], dict[str, list[Endpoint]]]:
+        selected = {id(endpoint) for tag, endpoints in self.spec.grouped_endpoints.items() for endpoint in endpoints if self.__is_selected(tag, endpoint)}
+        unmatched = [pattern for pattern in self.paths
+                     if not any(fnmatchcase(endpoint.path, pattern) for endpoints in self.spec.grouped_endpoints.values() for endpoint in endpoints)]
+        if unmatched:
+            raise ValueError(f'No endpoint matches the paths {", ".join(unmatched)}')
+
+        subset = {}
+        for root in self.spec.root_endpoints:
+            leaf_endpoints = [leaf for leaf in root.leaf_endpoints if id(leaf) in selected]
+            linkage_endpoints = [linkage for linkage in root.linkage_endpoints if id(linkage) in selected]
+
+            if id(root) in selected:
+                subset[id(root)] = replace(root, leaf_endpoints=leaf_endpoints, linkage_endpoints=linkage_endpoints)
+            elif leaf_endpoints or linkage_endpoints:
+                subset[id(root)] = Endpoint(root.path, root.endpoint_type, root.method, root.class_name, root.has_id_param, root.tags,
+                                            leaf_endpoints=leaf_endpoints, linkage_endpoints=linkage_endpoints)
+
+        grouped_endpoints = {}
+        for tag, endpoints in self.spec.grouped_endpoints.items():
+            tag_endpoints = [subset.get(id(endpoint), endpoint) for endpoint in endpoints if id(endpoint) in subset or id(endpoint) in selected]
+            if tag_endpoints:
+                grouped_endpoints[tag] = tag_endpoints
+
+        root_endpoints = [subset[id(root)] for root in self.spec.root_endpoints if id(root) in subset]
+        return root_endpoints, grouped_endpoints
+
+    def referenced_names(self, grouped_endpoints: dict[str, list[Endpoint]]) -> set[str]:
+        """
+        Returns the names of the schemas, shapes and enums referenced by the endpoints, transitively.
+        """
+        schemas = {schema.name: schema for schema in self.spec.requests + self.spec.responses + self.spec.models + self.spec.shapes}
+        names = set()
+        pending = list(self.required_schemas)
+
+        def add_type(type: TypeRef):
+            if type.kind == TypeKind.NAMED:
+                pending.append(type.name)
+            for item in type.items:
+                add_type(item)
+
+        def add_schema(schema: Schema):
+            if schema.shape:
+                pending.append(schema.shape)
+            for attr in schema.attributes:
+                add_type(attr.type)
+            for nested in schema.nested_classes:
+                add_schema(nested)
+
+        for endpoints in grouped_endpoints.values():
+            for endpoint in endpoints:
+                for operation in [endpoint.operation_get, endpoint.operation_post, endpoint.operation_patch, endpoint.operation_delete]:
+                    if operation:
+                        pending.append(getattr(operation, 'response_type', None))
+                        pending.append(getattr(operation, 'request_type', None))
+                pending.extend(f.item_type for f in endpoint.filters)
+
+        while pending:
+            name = pending.pop()
+            if name is None or name in names:
+                continue
+
+            names.add(name)
+            if name in schemas:
+                add_schema(schemas[name])
+
+        return names
+
+    def select(self) -> Spec:
+        root_endpoints, grouped_endpoints = self.select_endpoints()
+        names = self.referenced_names(grouped_endpoints)
+
+        requests = [schema for schema in self.spec.requests if schema.name in names]
+        responses = [schema for schema in self.spec.responses if schema.name in names]
+        models = [schema for schema in self.spec.models if schema.name in names]
+        shapes = [schema for schema in self.spec.shapes if schema.name in names]
+
+        # Enums lifted to the top level by dropped schemas are still referenced by the kept ones
+        enums = {name: values for name, values in self.spec.enums.items() if name in names}
+        for schema in self.spec.requests + self.spec.responses + self.spec.models:
+            for name, values in schema.remain_enums.items():
+                if name in names:
+                    enums.setdefault(name, values)
+
+        used_fields = {name for endpoints in grouped_endpoints.values() for endpoint in endpoints for name in endpoint.fields_enums}
+        fields_enums = {name: values for name, values in self.spec.fields_enums.items() if name in used_fields}
+
+        return Spec(self.spec.metadata, root_endpoints, grouped_endpoints, fields_enums, enums, requests, responses, models, shapes,
+                    self.spec.schemas_json)
@@ -1,18 +1,27 @@
 import re
+from functools import lru_cache
 
+_dot_pattern = re.compile('(\\.)')
+_word_pattern = re.compile('(.)([A-Z][a-z]+)')
+_double_underscore_pattern = re.compile('__([A-Z])')
+_lower_upper_pattern = re.compile('([a-z0-9])([A-Z])')
+
+# Filters are called thousands of times with the same few hundred names
+@lru_cache(maxsize=None)
 def snake_case(name: str):
     """
     https://stackoverflow.com/a/1176023/1371716
     """
-    name = re.sub('(\\.)', r'_', name)
-    name = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-    name = re.sub('__([A-Z])', r'_\1', name)
-    name = re.sub('([a-z0-9])([A-Z])', r'\1_\2', name)
+    name = _dot_pattern.sub(r'_', name)
+    name = _word_pattern.sub(r'\1_\2', name)
+    name = _double_underscore_pattern.sub(r'_\1', name)
+    name = _lower_upper_pattern.sub(r'\1_\2', name)
     return name.lower()
 
 def capfirst(value: str):
     return value[:1].upper() + value[1:]
 
+@lru_cache(maxsize=None)
 def simple_singular(value: str):
     if value.endswith('ies'):
         return value[:-3] + 'y'
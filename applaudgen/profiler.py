@@ -0,0 +1,184 @@
+import sys, time, tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterator
+from jinja2 import Environment, Template
+
+@dataclass
+class Stats:
+    calls: int = 0
+    wall_time: float = 0.0
+    peak_memory: int = 0
+
+class NullProfiler:
+    """
+    Profiler that records nothing, used when profiling is disabled.
+    """
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        yield
+
+    def instrument(self, jinja_env: Environment):
+        pass
+
+    def finish(self):
+        pass
+
+class ProfiledTemplate(Template):
+    """
+    Template that reports its rendering time to the profiler of its environment.
+    """
+
+    def render(self, *args, **kwargs) -> str:
+        started = time.perf_counter()
+        try:
+            return super().render(*args, **kwargs)
+        finally:
+            self.environment.profiler.record_template(self.name, time.perf_counter() - started)
+
+    def generate(self, *args, **kwargs) -> Iterator[str]:
+        elapsed = 0.0
+        iterator = super().generate(*args, **kwargs)
+
+        while True:
+            started = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                elapsed += time.perf_counter() - started
+            yield chunk
+
+        self.environment.profiler.record_template(self.name, elapsed)
+
+class Profiler(NullProfiler):
+    """
+    Records wall time, call counts and peak memory of generation phases, template renderings and filters.
+
+    Phases may be nested, the peak memory of a phase is the increase of traced memory over its start.
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.phases: dict[str, Stats] = {}
+        self.templates: dict[str, Stats] = {}
+        self.filters: dict[str, Stats] = {}
+        self._stack: list[list] = []
+        self._restore: list[Callable] = []
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start_memory = 0
+        if self.trace_memory:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            self.__propagate_peak()
+            tracemalloc.reset_peak()
+
+        # [name, start memory, peak memory reached by finished nested phases]
+        frame = [name, start_memory, 0]
+        self._stack.append(frame)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+
+            peak = 0
+            if self.trace_memory:
+                absolute_peak = max(tracemalloc.get_traced_memory()[1], frame[2])
+                peak = absolute_peak - start_memory
+                if self._stack:
+                    self._stack[-1][2] = max(self._stack[-1][2], absolute_peak)
+
+            stats = self.phases.setdefault(name, Stats())
+            stats.calls += 1
+            stats.wall_time += elapsed
+            stats.peak_memory = max(stats.peak_memory, peak)
+
+    def __propagate_peak(self):
+        # Keep the peak reached so far before it is reset by a nested phase
+        if self._stack:
+            self._stack[-1][2] = max(self._stack[-1][2], tracemalloc.get_traced_memory()[1])
+
+    def record_template(self, name: str, elapsed: float):
+        stats = self.templates.setdefault(name, Stats())
+        stats.calls += 1
+        stats.wall_time += elapsed
+
+    def instrument(self, jinja_env: Environment):
+        """
+        Instruments templates loaded afterwards by the environment and the filters, wherever they are called from.
+        """
+        jinja_env.profiler = self
+        jinja_env.template_class = ProfiledTemplate
+
+        for name, func in list(jinja_env.filters.items()):
+            if not getattr(func, '__module__', '').startswith('applaudgen'):
+                continue
+
+            wrapper = self.__wrap_filter(name, func)
+            jinja_env.filters[name] = wrapper
+
+            # Builders call filters as plain functions too
+            for module in list(sys.modules.values()):
+                if module and module.__name__.startswith('applaudgen'):
+                    for attr, value in list(vars(module).items()):
+                        if value is func:
+                            setattr(module, attr, wrapper)
+                            self._restore.append(lambda module=module, attr=attr, func=func: setattr(module, attr, func))
+
+    def __wrap_filter(self, name: str, func: Callable) -> Callable:
+        stats = self.filters.setdefault(name, Stats())
+
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.calls += 1
+                stats.wall_time += time.perf_counter() - started
+
+        wrapper.__name__ = func.__name__
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def finish(self):
+        """
+        Restores instrumented filters and stops tracing memory.
+        """
+        for restore in self._restore:
+            restore()
+        self._restore.clear()
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def as_dict(self) -> dict:
+        return {
+            'phases': {name: asdict(stats) for name, stats in self.phases.items()},
+            'templates': {name: asdict(stats) for name, stats in self.templates.items()},
+            'filters': {name: asdict(stats) for name, stats in self.filters.items()},
+        }
+
+    def report(self) -> str:
+        lines = []
+
+        def table(title: str, rows: dict[str, Stats], with_memory: bool):
+            lines.append(f'{title:<48} {"calls":>8} {"wall ms":>10}' + (f' {"peak KiB":>10}' if with_memory else ''))
+            for name, stats in sorted(rows.items(), key=lambda item: -item[1].wall_time):
+                line = f'{name:<48} {stats.calls:>8} {stats.wall_time * 1000:>10.1f}'
+                if with_memory:
+                    line += f' {stats.peak_memory / 1024:>10.1f}'
+                lines.append(line)
+            lines.append('')
+
+        table('Phase', self.phases, self.trace_memory)
+        table('Template', self.templates, False)
+        table('Filter', self.filters, False)
+        return '\n'.join(lines)
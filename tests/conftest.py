@@ -0,0 +1,42 @@
+import sys
+import pytest
+from applaudgen.generators.python import GENERATORS
+from test_generation import SPEC_FILE
+
+@pytest.fixture(scope='session')
+def applaud(tmp_path_factory):
+    '''The generated package with its mock server, importable as ``applaud`` by the tests using it.'''
+    output_dir = tmp_path_factory.mktemp('generated')
+    GENERATORS['native'](SPEC_FILE, str(output_dir / 'applaud'), mock=True, cache_dir=None).generate()
+    sys.path.insert(0, str(output_dir))
+    try:
+        import applaud
+        yield applaud
+    finally:
+        sys.path.remove(str(output_dir))
+
+@pytest.fixture(scope='session')
+def private_key(applaud):
+    from applaud.mock.load import generate_private_key
+    return generate_private_key()
+
+@pytest.fixture
+def mock_server(applaud):
+    '''Starts mock servers configured by the test, and stops them once it ends.'''
+    from applaud.mock.server import MockServer
+    servers = []
+
+    def start(**kwargs):
+        servers.append(MockServer(**kwargs).start())
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.stop()
+
+@pytest.fixture
+def connect(private_key):
+    def connect(server, **kwargs):
+        from applaud.connection import Connection
+        return Connection('issuer', 'KEY', private_key, base_url=server.url, **kwargs)
+    return connect
@@ -0,0 +1,49 @@
+import threading
+import time
+import pytest
+
+def test_cancel_gives_up_the_request_in_flight(applaud, mock_server, connect):
+    from applaud.cancellation import Cancelled, CancellationToken
+    connection = connect(mock_server(latency=2.0))
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel).start()
+
+    started = time.monotonic()
+    with pytest.raises(Cancelled):
+        connection.apps().cancellation(token).get()
+
+    assert time.monotonic() - started < 1.0
+
+def test_cancel_by_a_parent_token(applaud, mock_server, connect):
+    from applaud.cancellation import Cancelled, CancellationToken
+    connection = connect(mock_server(latency=2.0))
+    parent = CancellationToken()
+    threading.Timer(0.2, parent.cancel).start()
+
+    started = time.monotonic()
+    with pytest.raises(Cancelled):
+        connection.apps().cancellation(CancellationToken(parent=parent)).get()
+
+    assert time.monotonic() - started < 1.0
+
+def test_cancel_fan_out(applaud, mock_server, connect):
+    from applaud.cancellation import Cancelled, CancellationToken, scope
+    connection = connect(mock_server(latency=2.0))
+    token = CancellationToken()
+    threading.Timer(0.2, token.cancel).start()
+
+    started = time.monotonic()
+    with scope(token), pytest.raises(Cancelled):
+        list(connection.fan_out(lambda i: connection.apps().limit(1).get(), range(20)))
+
+    assert time.monotonic() - started < 1.0
+
+def test_deadline_of_a_request_in_flight(applaud, mock_server, connect):
+    from applaud.cancellation import DeadlineExceeded
+    connection = connect(mock_server(latency=2.0))
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        connection.apps().deadline(0.2).get()
+
+    assert time.monotonic() - started < 1.0
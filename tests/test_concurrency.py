@@ -0,0 +1,62 @@
+import pytest
+
+CAPACITY = 8
+
+def test_fan_out_settles_near_capacity(applaud, mock_server, connect):
+    from applaud.concurrency import AIMDLimiter
+    server = mock_server(capacity=CAPACITY, latency=0.02)
+    connection = connect(server)
+    limiter = AIMDLimiter(initial=2, maximum=64)
+    limits = []
+    connection.register_hook('after_request', lambda record, response: limits.append(limiter.limit))
+
+    # The mock rejects the requests past twice its capacity with 503, they are retried within the decreased limit
+    results = list(connection.fan_out(lambda i: (i, connection.apps().limit(1).get()), range(1000), limiter=limiter))
+
+    assert [i for i, _ in results] == list(range(1000))
+    assert limiter.decreases > 0
+    # Once settled, the limit oscillates around the concurrency the mock starts rejecting, far below its maximum
+    settled = limits[len(limits) // 2:]
+    assert sum(settled) / len(settled) < 3 * CAPACITY
+    assert max(settled) < limiter.maximum / 2
+
+def test_fan_out_raises_once_attempts_run_out(applaud, mock_server, connect):
+    from applaud.concurrency import AIMDLimiter
+    from applaud.endpoints.base import EndpointException
+    server = mock_server(rate_limit=1)
+    connection = connect(server)
+    calls = []
+
+    def get(i):
+        calls.append(i)
+        return connection.apps().limit(1).get()
+
+    with pytest.raises(EndpointException) as error:
+        list(connection.fan_out(get, range(3), limiter=AIMDLimiter(initial=1, maximum=1), attempts=3))
+
+    assert error.value.response.status_code == 429
+    # The first call succeeds, the second one fails on each of its attempts
+    assert calls[:4] == [0, 1, 1, 1]
+
+def test_fan_out_does_not_retry_other_errors(applaud, mock_server, connect):
+    connection = connect(mock_server())
+    calls = []
+
+    def fail(i):
+        calls.append(i)
+        raise ValueError(i)
+
+    with pytest.raises(ValueError):
+        list(connection.fan_out(fail, [0]))
+    assert calls == [0]
+
+@pytest.mark.parametrize('retry_after, expected', [('2', 2.0), ('Thu, 01 Jan 1970 00:00:00 GMT', 0.0)])
+def test_retry_after(applaud, retry_after, expected):
+    import requests
+    from applaud.concurrency import retry_delay
+    response = requests.Response()
+    response.status_code = 429
+    response.headers['Retry-After'] = retry_after
+    error = requests.HTTPError(response=response)
+
+    assert retry_delay(error, 1) == expected
@@ -0,0 +1,17 @@
+def test_pool_failover_counts_a_retry(applaud, mock_server, private_key):
+    from applaud.connection import Connection, ConnectionPool
+    from applaud.instrumentation import MetricsCollector
+    server = mock_server(rate_limit=1)
+    # The quota of the first key is spent before the pool hears of it
+    Connection('issuer', 'KEY0', private_key, base_url=server.url).request('GET', server.url + '/v1/apps')
+    pool = ConnectionPool([('issuer', f'KEY{i}', private_key) for i in range(2)], base_url=server.url)
+    collector = MetricsCollector()
+    collector.install(pool)
+
+    apps = pool.apps().get()
+
+    assert apps.data
+    metrics = collector.as_dict()['AppsEndpoint']
+    assert metrics['requests'] == 1
+    assert metrics['retries'] == 1
+    assert metrics['status_codes'] == {200: 1}
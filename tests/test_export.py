@@ -0,0 +1,18 @@
+import csv
+import io
+import json
+
+def test_csv_and_ndjson_write_the_same_scalars(applaud):
+    from applaud.export import CSVWriter, NDJSONWriter
+    fields = {'betaTesters': ['firstName', 'isDeleted', 'lastName', 'inviteType']}
+    resource = {'type': 'betaTesters', 'id': 'tester-1', 'attributes': {'firstName': 'Ada', 'isDeleted': False, 'lastName': None}}
+    ndjson, csv_output = io.StringIO(), io.StringIO()
+
+    NDJSONWriter(ndjson, fields).write(resource)
+    CSVWriter(csv_output, fields).write(resource)
+
+    attributes = json.loads(ndjson.getvalue())['attributes']
+    header, row = csv.reader(io.StringIO(csv_output.getvalue()))
+    assert header == ['id', 'firstName', 'isDeleted', 'lastName', 'inviteType']
+    assert row == ['tester-1', attributes['firstName'], json.dumps(attributes['isDeleted']), json.dumps(attributes['lastName']), '']
+    assert row[2:4] == ['false', 'null']
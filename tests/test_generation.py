@@ -0,0 +1,52 @@
+import json
+import os
+import tracemalloc
+import pytest
+from applaudgen.benchmarks import scale_spec
+from applaudgen.generators.python import GENERATORS
+
+SPEC_FILE = os.path.join(os.path.dirname(__file__), '..', 'app_store_connect_api.json')
+
+# Schema classes are streamed to their modules, so generating the package takes a few MiB at most
+PEAK_MEMORY_BOUND = 4 * 1024 * 1024
+
+@pytest.mark.parametrize('models', GENERATORS.keys())
+def test_generation_peak_memory(tmp_path, models):
+    generator = GENERATORS[models](SPEC_FILE, str(tmp_path / 'applaud'), cache_dir=None, only_tags=['Builds', 'BetaTesters'])
+
+    tracemalloc.start()
+    try:
+        generator.generate()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert os.path.isfile(tmp_path / 'applaud' / 'schemas' / 'models.py')
+    assert peak < PEAK_MEMORY_BOUND, f'Generation peaked at {peak / 1024 / 1024:.1f} MiB'
+
+def test_regeneration_keeps_foreign_files(tmp_path):
+    output_dir = tmp_path / 'applaud'
+    GENERATORS['native'](SPEC_FILE, str(output_dir), mock=True, cache_dir=None, only_tags=['Builds', 'BetaTesters']).generate()
+    (output_dir / 'py.typed').write_text('')
+    (output_dir / 'endpoints' / 'custom_helpers.py').write_text('HELPER = 1\n')
+
+    GENERATORS['native'](SPEC_FILE, str(output_dir), cache_dir=None, only_tags=['Builds']).generate()
+
+    # Files added by hand survive, those of the wider previous generation do not
+    assert (output_dir / 'py.typed').is_file()
+    assert (output_dir / 'endpoints' / 'custom_helpers.py').read_text() == 'HELPER = 1\n'
+    assert (output_dir / 'endpoints' / 'builds.py').is_file()
+    assert not (output_dir / 'endpoints' / 'beta_testers.py').exists()
+    assert not (output_dir / 'mock').exists()
+
+def test_scaled_copies_keep_filter_enums(tmp_path):
+    with open(SPEC_FILE) as f:
+        spec = scale_spec(json.load(f), 2)
+    spec_file = tmp_path / 'spec.json'
+    spec_file.write_text(json.dumps(spec))
+
+    output_dir = tmp_path / 'applaud'
+    GENERATORS['native'](str(spec_file), str(output_dir), cache_dir=None, only_tags=['BuildsCopy2']).generate()
+
+    # Enums of the filters of the copies are embedded in their endpoint classes
+    assert 'processing_state: Union[ProcessingState, list[ProcessingState]]' in (output_dir / 'endpoints' / 'builds_copy2.pyi').read_text()
@@ -0,0 +1,16 @@
+def test_fetch_retries_the_failed_pages_only(applaud, mock_server, connect):
+    from applaud.planner import GraphFetcher
+    # Builds are truncated in the response of the app, and completed from 3 pages of its related endpoint
+    server = mock_server(capacity=1, latency=0.01, error_rate=0.5, collection_size=450)
+    connection = connect(server)
+    statuses = []
+    connection.register_hook('after_request', lambda record, response: statuses.append(record.status_code))
+
+    fetcher = GraphFetcher(connection)
+    app = fetcher.fetch(connection.app('app-1'), ['builds', 'appStoreVersions'])
+
+    assert len(app['related']['builds']) == 450
+    assert len(app['related']['appStoreVersions']) == 450
+    assert 429 in statuses
+    # Every page is fetched once, whatever the failures of the other pages of its request
+    assert statuses.count(200) == fetcher.requests
@@ -0,0 +1,42 @@
+import gzip
+import io
+import pytest
+
+def test_record_and_replay(applaud, mock_server, connect, tmp_path):
+    from applaud.transport import RecordingTransport, ReplayTransport, ReplayError
+    server = mock_server()
+    recorded = connect(server, transport=RecordingTransport(str(tmp_path)))
+    apps = recorded.apps().limit(10).get()
+    builds = list(recorded.app(apps.data[0].id).builds().pages())
+    server.stop()
+
+    replayed = connect(server, transport=ReplayTransport(str(tmp_path)))
+
+    assert replayed.apps().limit(10).get() == apps
+    assert list(replayed.app(apps.data[0].id).builds().pages()) == builds
+    with pytest.raises(ReplayError):
+        replayed.apps().limit(20).get()
+
+def test_record_decodes_streamed_contents(applaud, tmp_path):
+    import urllib3
+    from applaud.transport import RecordingTransport, ReplayTransport, Transport, build_response
+
+    class EncodingTransport(Transport):
+        def request(self, method, url, *, params=None, json=None, headers=None, stream=False, timeout=None):
+            # Like the responses of requests, the raw stream is not decoded
+            raw = urllib3.HTTPResponse(io.BytesIO(gzip.compress(b'{"data": []}')), headers={'Content-Encoding': 'gzip'},
+                                       status=200, preload_content=False, decode_content=False)
+            return build_response(method, url, None, 200, 'OK', raw.headers, raw=raw)
+
+    url = 'https://api.appstoreconnect.apple.com/v1/salesReports'
+    response = RecordingTransport(str(tmp_path), EncodingTransport()).request('GET', url, stream=True)
+    replayed = ReplayTransport(str(tmp_path)).request('GET', url, stream=True)
+
+    assert response.content == replayed.content == b'{"data": []}'
+
+def test_session_of_a_transport_without_session(applaud, mock_server, connect, tmp_path):
+    from applaud.transport import Urllib3Transport
+    connection = connect(mock_server(), transport=Urllib3Transport())
+
+    with pytest.raises(TypeError, match='Urllib3Transport'):
+        connection.session